@@ -0,0 +1,56 @@
+# 比較查表(CycleTable)同時段規則(PhaseProfile, bisect)嘅日夜/倒數查詢速度
+# 用法: python benchmarks/bench_cycle_table.py [-n 次數]
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import eft_time
+
+CASES = {
+    'is_night_time': lambda s: eft_time.is_night_time(s),
+    'get_time_until_night': lambda s: eft_time.get_time_until_night(s),
+    'time_until_night_ends': lambda s: eft_time.time_until_night_ends(s),
+    'TarkovTime.is_night': lambda t: t.is_night,
+    'TarkovTime.countdown': lambda t: t.countdown(),
+}
+
+def snapshot():
+    """記低成日每一秒嘅結果, 用嚟檢查查表同直接計算一致"""
+    return [(t.is_night, t.countdown(), eft_time.get_time_until_night(str(t)))
+            for t in map(eft_time.TarkovTime, range(24 * 3600))]
+
+def run(number:int):
+    samples = [eft_time.TarkovTime(s) for s in range(0, 24 * 3600, 97)]
+    strings = [str(t) for t in samples]
+    results = {}
+    for name, fn in CASES.items():
+        args = samples if name.startswith('TarkovTime') else strings
+        loops = max(1, number // len(args))
+        seconds = timeit.timeit(lambda: [fn(a) for a in args], number=loops)
+        results[name] = seconds / (loops * len(args)) * 1e9
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='EFT Timer cycle table benchmark')
+    parser.add_argument('-n', type=int, default=200000, help='每項大約調用次數')
+    args = parser.parse_args()
+
+    reference = snapshot()
+    columns = {'profile': run(args.n)}
+    for step, label in ((1, 'table/s'), (60, 'table/min')):
+        table = eft_time.use_cycle_table(step)
+        if snapshot() != reference:
+            print(f'{label}: 結果同直接計算唔一致')
+            sys.exit(1)
+        columns[f'{label} ({table.nbytes() / 1024:.0f} KB)'] = run(args.n)
+    eft_time.use_cycle_table(None)
+
+    print(f'{"ns/call":<24}' + ''.join(f'{c:>20}' for c in columns))
+    for name in CASES:
+        print(f'{name:<24}' + ''.join(f'{col[name]:>20.0f}' for col in columns.values()))
+
+if __name__ == '__main__':
+    main()
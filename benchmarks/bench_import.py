@@ -0,0 +1,70 @@
+# 量度無頭(headless)路徑嘅 import 時間同冷啟動時間
+# 用法: python benchmarks/bench_import.py [-n 次數]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('tkinter', '_tkinter', 'winsound', 'numpy')  # 無頭路徑唔應該載入嘅模組
+
+def import_time(module:str):
+    """用 python -X importtime 量度 import 一個模組嘅時間
+
+    返回:
+        tuple[int, list[tuple[int, str]]]: (總時間微秒, 最慢嘅幾個模組)
+    """
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in out.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), name.strip()))
+    total = next(c for c, name in reversed(rows) if name == module)
+    return total, sorted(rows, reverse=True)[:8]
+
+def loaded_heavy_modules(code:str):
+    """返回執行 code 之後載入咗嘅重型模組"""
+    check = f'{code}; import sys; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    out = subprocess.run([sys.executable, '-c', check], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(',') if m]
+
+def cold_start(args:list, runs:int):
+    """量度開一個新進程執行 args 嘅時間(毫秒)"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description='EFT Timer import benchmark')
+    parser.add_argument('-n', type=int, default=10, help='冷啟動重複次數')
+    args = parser.parse_args()
+
+    ok = True
+    for module in ('eft_time', 'eft_timer'):
+        total, top = import_time(module)
+        heavy = loaded_heavy_modules(f'import {module}')
+        ok &= not heavy
+        print(f'import {module}: {total / 1000:.2f} ms, heavy modules: {heavy or "none"}')
+        for cumulative, name in top:
+            print(f'    {cumulative / 1000:8.2f} ms  {name}')
+
+    baseline, _ = cold_start(['-c', 'pass'], args.n)
+    median, best = cold_start(['eft_timer.py', '--api'], args.n)
+    print(f'python -c pass: {baseline:.1f} ms (median)')
+    print(f'eft_timer.py --api: {median:.1f} ms (median), {best:.1f} ms (best), '
+          f'{median - baseline:.1f} ms over bare interpreter')
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
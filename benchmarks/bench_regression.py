@@ -0,0 +1,301 @@
+# 時間引擎同 GUI 更新嘅基準測試兼回歸檢查: 先用參考實現逐秒核對所有快速路徑,
+# 再量度每次調用時間同記憶體, 同 baseline.json 比較, 慢過門檻就失敗
+# 用法: python benchmarks/bench_regression.py [--save] [--threshold 0.25] [--stub-tk]
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import eft_time
+from bench_import import cold_start
+from eft_timer import get_time_info
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+THRESHOLD = 0.25  # 慢過 baseline 25% 就當係回歸
+RETRIES = 2  # 疑似回歸嘅項目再量幾多次(取最好), 避免被其他進程搶 CPU 誤判
+COMPARED = ('relative', 'bytes/call')  # 同 baseline 比較嘅指標, 絕對時間只係顯示
+FLOORS = {'bytes/call': 64}  # 絕對容許誤差(tracemalloc 會受 free list 影響)
+START = 1700000000000
+
+# 參考實現: 直接由 night_ranges 同原本公式逐個計, 唔經 PhaseProfile/查表/numpy
+
+def ref_tarkov_seconds(left:bool, current_time:int):
+    offset = eft_time.RUSSIA_OFFSET + (0 if left else eft_time.SIDE_OFFSET)
+    return (offset + current_time * eft_time.TARKOV_RATIO) % eft_time.ONE_DAY // 1000
+
+def ref_hms(seconds:int):
+    hours, rest = divmod(seconds, 3600)
+    return '%02d:%02d:%02d' % (hours, rest // 60, rest % 60)
+
+def ref_is_night(seconds:int):
+    minutes = seconds // 60
+    return any(start <= minutes < end for start, end in eft_time.night_ranges)
+
+def ref_next_change():
+    """每個塔科夫分鐘之後下一次日夜轉換喺第幾分鐘(可能超過一日), 日夜轉換一定喺整分鐘"""
+    day = 24 * 60
+    night = [ref_is_night(m % day * 60) for m in range(2 * day + 1)]
+    change = [2 * day] * (2 * day + 1)
+    for m in range(2 * day - 1, -1, -1):
+        change[m] = m + 1 if night[m + 1] != night[m] else change[m + 1]
+    return change[:day]
+
+def ref_countdown(seconds:int, change:list):
+    return (change[seconds // 60] * 60 - seconds) // eft_time.TARKOV_RATIO
+
+def ref_hm(seconds:int):
+    return '%02d:%02d' % (seconds // 3600, seconds // 60 % 60)
+
+def check_correctness():
+    """用參考實現核對所有快速路徑, 返回唔一致嘅描述"""
+    errors = []
+    day = range(24 * 3600)
+    night = [ref_is_night(s) for s in day]
+    change = ref_next_change()
+    countdown = [ref_countdown(s, change) for s in day]
+    strings = [ref_hms(s) for s in day]
+
+    def compare(name, values, expected):
+        for s, (value, want) in enumerate(zip(values, expected)):
+            if value != want:
+                errors.append(f'{name}: 第{s}個結果係 {value!r}, 應該係 {want!r}')
+                return
+
+    for step in (None, 1, 60):
+        label = 'profile' if step is None else f'CycleTable({step})'
+        eft_time.use_cycle_table(step)
+        times = [eft_time.TarkovTime(s) for s in day]
+        compare(f'{label} is_night', [t.is_night for t in times], night)
+        compare(f'{label} countdown', [t.countdown() for t in times], countdown)
+        compare(f'{label} is_night_time', map(eft_time.is_night_time, strings), night)
+        compare(f'{label} get_time_until_night', map(eft_time.get_time_until_night, strings),
+                [(n, ref_hm(c)) for n, c in zip(night, countdown)])
+    eft_time.use_cycle_table(None)
+
+    compare('format_hms', (eft_time.format_hms(s * 1000 + 999) for s in day), strings)
+    from eft_batch import _hms_table
+    compare('eft_batch._hms_table', list(_hms_table()), strings)
+
+    # 現實時間: 兩個塔科夫日, 每次跳 997 毫秒, 兩邊都要計
+    stamps = list(range(START, START + 2 * eft_time.ONE_DAY // eft_time.TARKOV_RATIO, 997))
+    for left in (True, False):
+        seconds = [ref_tarkov_seconds(left, t) for t in stamps]
+        compare(f'get_tarkov_time({left})', (eft_time.get_tarkov_time(left, t) for t in stamps),
+                [strings[s] for s in seconds])
+        compare(f'time_info({left})',
+                ((i['time'], i['is_night'], i['countdown'])
+                 for i in (eft_time.time_info(t)['left' if left else 'right'] for t in stamps[::50])),
+                [(strings[s], night[s], ref_hm(countdown[s])) for s in seconds[::50]])
+        expected = (seconds, [night[s] for s in seconds], [countdown[s] for s in seconds])
+        numpy = eft_time._numpy
+        for label, backend in (('numpy', numpy), ('python', lambda: None)):
+            if label == 'numpy' and numpy() is None:
+                continue
+            eft_time._numpy = backend
+            try:
+                batch = eft_time.get_tarkov_times(stamps, left)
+            finally:
+                eft_time._numpy = numpy
+            for name, column, want in zip(('seconds', 'is_night', 'until'), batch, expected):
+                compare(f'get_tarkov_times[{label}]({left}) {name}', [type(w)(v) for v, w in zip(column, want)], want)
+    return errors
+
+def calibration():
+    # 固定嘅純 Python 工作量, 每輪同被測函數交替執行, 用嚟抵銷機器快慢同其他進程搶 CPU
+    total = 0
+    for i in range(8):
+        total += len(f'{i // 3:02}:{i % 60:02}') + (i * 7) % 13
+    return total
+
+def measure(fn, args, number:int, repeat:int=25):
+    """量度 fn 嘅速度同記憶體
+
+    分開好多輪短時間量度再取最快, 每輪之前先跑一次 calibration(), relative 係兩者最快一輪嘅比例,
+    唔受機器快慢影響, 用嚟同 baseline 比較.
+
+    返回:
+        dict: {'ns/call': 每次調用時間, 'relative': 相對 calibration 嘅時間, 'bytes/call': 單次調用嘅記憶體峰值}
+    """
+    loops = max(1, number // len(args) // repeat)
+    reference = timeit.Timer(lambda: [calibration() for a in args])
+    timer = timeit.Timer(lambda: [fn(*a) for a in args])
+    base = best = float('inf')
+    for _ in range(repeat):
+        base = min(base, reference.timeit(loops))
+        best = min(best, timer.timeit(loops))
+    tracemalloc.start()
+    peak = 0
+    for a in args[:200]:
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(*a)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return {'ns/call': best / (loops * len(args)) * 1e9, 'relative': best / base, 'bytes/call': peak}
+
+def engine_cases(number:int):
+    """返回 {項目名: 量度函數}"""
+    stamps = [START + i * 1000003 for i in range(512)]
+    strings = [eft_time.format_hms(eft_time.tarkov_ms(True, t)) for t in stamps]
+    cases = {
+        'get_tarkov_time': (eft_time.get_tarkov_time, [(i % 2 == 0, t) for i, t in enumerate(stamps)]),
+        'format_hms': (eft_time.format_hms, [(eft_time.tarkov_ms(True, t),) for t in stamps]),
+        'is_night_time': (eft_time.is_night_time, [(s,) for s in strings]),
+        'get_time_until_night': (eft_time.get_time_until_night, [(s,) for s in strings]),
+        'get_time_info': (get_time_info, [()] * 64)
+    }
+    return {name: (lambda fn=fn, args=args: measure(fn, args, number)) for name, (fn, args) in cases.items()}
+
+def api_cold_start(runs:int):
+    """--api 冷啟動最快一次嘅時間, relative 係相對 python -c pass 嘅倍數"""
+    _, bare = cold_start(['-c', 'pass'], runs)
+    _, best = cold_start(['eft_timer.py', '--api'], runs)
+    return {'ms': best, 'relative': best / bare}
+
+def stub_tkinter():
+    """換入一個乜都唔做嘅 tkinter, 冇顯示器都可以量度 Python 嗰邊嘅更新成本"""
+    class Interp:
+        def call(self, *args):
+            return ''
+
+    class Widget:
+        tk = Interp()
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: ''
+
+    tkinter = types.ModuleType('tkinter')
+    tkinter.TclError = type('TclError', (Exception,), {})
+    tkinter.Tk = tkinter.Toplevel = tkinter.Canvas = Widget
+    ttk = types.ModuleType('tkinter.ttk')
+    ttk.Frame = ttk.Label = ttk.Button = ttk.Style = Widget
+    font = types.ModuleType('tkinter.font')
+    font.Font = Widget
+    tkinter.ttk, tkinter.font = ttk, font
+    sys.modules.update({'tkinter': tkinter, 'tkinter.ttk': ttk, 'tkinter.font': font})
+
+def gui_cases(number:int, stub:bool):
+    """量度 TimeDisplay.update_display 同 MainWindow.update_time, 冇顯示器就自動用假 Tk
+
+    返回:
+        dict: {項目名: 量度函數}, 窗口會一直保留到進程結束
+    """
+    if not stub:
+        import tkinter as tk
+        try:
+            tk.Tk().destroy()
+        except tk.TclError:
+            stub = True
+    if stub:
+        stub_tkinter()
+    from eft_gui import MainWindow
+    mode = 'stub Tk' if stub else 'Tk'
+    cases = {}
+    for renderer in ('label', 'canvas'):
+        app = MainWindow(renderer=renderer)
+        app.after_cancel(app._after_id)
+        ticks = iter(range(START, START + 10 ** 12, 1000))  # 每次都係新嘅一秒, 文字一定要改
+
+        def update_display(display=app.left_display, ticks=ticks):
+            display.update_display(True, next(ticks))
+
+        def update_time(app=app):
+            app.update_time()
+            app.after_cancel(app._after_id)
+
+        name = 'TimeDisplay' if renderer == 'label' else 'CanvasSide'
+        cases[f'{name}.update_display [{mode}]'] = lambda fn=update_display: measure(fn, [()] * 64, number)
+        cases[f'MainWindow.update_time ({renderer}) [{mode}]'] = lambda fn=update_time: measure(fn, [()] * 64, number)
+    return cases
+
+def compare(results:dict, baseline:dict, threshold:float):
+    """返回慢過 baseline 嘅 {項目名: [描述]}"""
+    regressions = {}
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(case, {}).get(metric)
+            if metric not in COMPARED:
+                continue
+            if base is not None and value > base * (1 + threshold) + FLOORS.get(metric, 0):
+                regressions.setdefault(case, []).append(
+                    f'{metric}: {value:.4g} (baseline {base:.4g}, +{value / max(base, 1e-9) - 1:.0%})')
+    return regressions
+
+def print_results(results:dict):
+    print(f'{"case":<44}{"calls/s":>14}{"time":>14}{"relative":>10}{"peak alloc":>14}')
+    for case, metrics in results.items():
+        if 'ms' in metrics:
+            print(f'{case:<44}{"":>14}{metrics["ms"]:>11.1f} ms{metrics["relative"]:>10.2f}')
+            continue
+        ns = metrics['ns/call']
+        print(f'{case:<44}{1e9 / ns:>14,.0f}{ns:>11.0f} ns{metrics["relative"]:>10.3f}{metrics["bytes/call"]:>12} B')
+
+def main():
+    parser = argparse.ArgumentParser(description='EFT Timer benchmark and regression suite')
+    parser.add_argument('-n', type=int, default=50000, help='每項大約調用次數')
+    parser.add_argument('--runs', type=int, default=10, help='--api 冷啟動重複次數')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help=f'容許慢幾多(比例), 預設 {THRESHOLD}')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON 文件')
+    parser.add_argument('--save', action='store_true', help='將今次結果(每項量 1+retries 次取最好)寫入 baseline, 唔做比較')
+    parser.add_argument('--stub-tk', action='store_true', help='有顯示器都用假 Tk, 同冇顯示器嘅 baseline 比較')
+    parser.add_argument('--retries', type=int, default=RETRIES, help=f'疑似回歸嘅項目再量幾多次，預設 {RETRIES}')
+    args = parser.parse_args()
+
+    errors = check_correctness()
+    for error in errors:
+        print(f'唔一致: {error}')
+    if errors:
+        sys.exit(1)
+    print('快速路徑同參考實現一致')
+
+    cases = engine_cases(args.n)
+    cases['eft_timer.py --api (cold start)'] = lambda: api_cold_start(args.runs)
+    cases.update(gui_cases(args.n // 5, args.stub_tk))
+    results = {case: run() for case, run in cases.items()}
+
+    if args.save:
+        # baseline 要穩定: 每項量多幾次取最好
+        for _ in range(args.retries):
+            for case, run in cases.items():
+                again = run()
+                results[case] = {metric: min(value, again[metric]) for metric, value in results[case].items()}
+        print_results(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results},
+                      f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'已寫入 {args.baseline}')
+        return
+    if not os.path.exists(args.baseline):
+        print(f'冇 {args.baseline}, 用 --save 建立')
+        return
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('python') != platform.python_version():
+        print(f'注意: baseline 用 Python {baseline.get("python")}, 而家係 {platform.python_version()}')
+    regressions = compare(results, baseline['results'], args.threshold)
+    for _ in range(args.retries):
+        if not regressions:
+            break
+        for case in regressions:
+            again = cases[case]()
+            results[case] = {metric: min(value, again[metric]) for metric, value in results[case].items()}
+        regressions = compare(results, baseline['results'], args.threshold)
+    print_results(results)
+    for case, problems in regressions.items():
+        for problem in problems:
+            print(f'回歸: {case} {problem}')
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
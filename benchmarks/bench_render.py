@@ -0,0 +1,67 @@
+# 比較標籤版(ttk.Label)同單一 Canvas 版嘅每次更新 CPU 時間同改變大小嘅成本
+# 要有顯示器(或者 Xvfb), 用法: python benchmarks/bench_render.py [-n 次數]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tkinter as tk
+from eft_gui import MainWindow
+
+SIZES = ('600x300', '900x420', '1280x560', '760x360')  # 輪流改變窗口大小
+
+def measure(renderer:str, ticks:int):
+    app = MainWindow(renderer=renderer)
+    app.after_cancel(app._after_id)  # 唔好俾自己嘅更新循環干擾
+    app.update()
+    displays = (app.left_display, app.right_display)
+    resizers = (app.canvas,) if app.canvas is not None else displays
+
+    start = 1700000000000
+    cpu = time.process_time()
+    for i in range(ticks):
+        now = start + i * 1000
+        for is_left, display in zip((True, False), displays):
+            display.update_display(is_left, now)
+        app.update_idletasks()  # 計埋 Tk 排版同重畫
+    tick_cpu = (time.process_time() - cpu) / ticks
+
+    resizes = max(1, ticks // 20)
+    cpu = time.process_time()
+    for i in range(resizes):
+        app.geometry(SIZES[i % len(SIZES)])
+        app.update_idletasks()
+        for resizer in resizers:
+            resizer.apply_resize()
+        app.update_idletasks()
+    resize_cpu = (time.process_time() - cpu) / resizes
+
+    stats = app.render_stats()
+    app.destroy()
+    return {
+        'us/tick': tick_cpu * 1e6,
+        'tk calls/tick': stats['tk_calls'] / ticks,
+        'us/resize': resize_cpu * 1e6,
+        'font reconfigs': stats['font_reconfigs']
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='EFT Timer renderer benchmark')
+    parser.add_argument('-n', type=int, default=2000, help='模擬更新次數')
+    args = parser.parse_args()
+
+    try:
+        results = {renderer: measure(renderer, args.n) for renderer in ('label', 'canvas')}
+    except tk.TclError as e:
+        print(f'開唔到 Tk 窗口(要有顯示器): {e}')
+        sys.exit(2)
+
+    columns = next(iter(results.values()))
+    print(f'{"renderer":<12}' + ''.join(f'{c:>18}' for c in columns))
+    for renderer, row in results.items():
+        print(f'{renderer:<12}' + ''.join(f'{v:>18.1f}' for v in row.values()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+# 規則式提醒: 每條規則直接由日夜轉換公式計出下次響嘅時間, 放入最小堆排程,
+# 所以更新循環只需要睇堆頂, 規則再多都唔會令每次更新變慢
+
+import heapq
+import itertools
+import math
+from eft_time import HORIZON, phase_windows
+
+PHASES = {'night': 'night', 'light': 'light', 'day': 'light', '夜': 'night', '日': 'light'}
+SIDES = ('any', 'all', 'left', 'right')
+MIN_REPEAT = 100  # repeat 最短間隔(毫秒), 太短會令更新循環/推送服務不停醒
+
+class AlertRule:
+    """提醒規則
+
+    參數:
+        phase (str): 'night' 或者 'light'(入夜/天光)
+        sides (str, optional): 'any' 任何一邊、'all' 兩邊都係、'left' 或者 'right', 預設值: 'any'.
+        lead (int, optional): 提早幾多毫秒響, 預設值: 0.
+        repeat (int, optional): 狀態維持期間每隔幾多毫秒再響, 最少 MIN_REPEAT, 預設值: 0(只喺轉換嗰下響).
+        once (bool, optional): 響一次之後就移除, 預設值: False.
+        name (str, optional): 顯示用嘅名, 預設值: None(自動生成).
+
+    Raises:
+        ValueError: 參數唔啱
+    """
+    def __init__(self, phase:str, sides:str='any', lead:int=0, repeat:int=0, once:bool=False, name:str=None):
+        if phase not in ('night', 'light'):
+            raise ValueError("phase must be 'night' or 'light'")
+        if sides not in SIDES:
+            raise ValueError("sides must be 'any', 'all', 'left' or 'right'")
+        if lead < 0 or repeat < 0:
+            raise ValueError('lead and repeat must not be negative')
+        if 0 < repeat < MIN_REPEAT:
+            raise ValueError(f'repeat must be at least {MIN_REPEAT} ms')
+        self.phase = phase
+        self.sides = sides
+        self.lead = int(lead)
+        self.repeat = int(repeat)
+        self.once = once
+        self.name = name or self.describe()
+
+    def describe(self):
+        text = {'any': '任何一邊', 'all': '兩邊', 'left': '左邊', 'right': '右邊'}[self.sides]
+        text += '入夜' if self.phase == 'night' else '天光'
+        if self.lead:
+            text += f'前{self.lead // 60000}分鐘' if self.lead % 60000 == 0 else f'前{self.lead / 1000:g}秒'
+        if self.once:
+            text += '(一次)'
+        return text
+
+    def __repr__(self):
+        return f'AlertRule({self.phase!r}, {self.sides!r}, lead={self.lead}, repeat={self.repeat}, once={self.once})'
+
+    def _windows(self, start:int, end:int):
+        return phase_windows(start, end, self.phase, self.sides)
+
+    def active(self, current_time:int):
+        """提早時間計埋, current_time 係咪處於要響嘅狀態"""
+        return next(self._windows(current_time, current_time + self.lead + 1), None) is not None
+
+    def next_entry(self, start:int):
+        """下一次進入狀態(減咗提早時間)嘅現實時間, 唔會再轉換就返回 None
+
+        參數:
+            start (int): 由呢個現實時間(毫秒, 包括)開始搵
+
+        返回:
+            int|None: 現實時間(毫秒)
+        """
+        # 由 start + lead - 1 開始搵, 開始時間大過佢嘅窗口先係真正嘅轉換(唔係被裁剪出嚟)
+        begin = start + self.lead - 1
+        for window_start, _ in self._windows(begin, begin + HORIZON):
+            if window_start > begin:
+                return window_start - self.lead
+        return None
+
+    def next_fire(self, start:int):
+        """下一次要響嘅現實時間(包括 start); 有 repeat 而且處於狀態中就即刻響"""
+        if self.repeat and self.active(start):
+            return start
+        return self.next_entry(start)
+
+def parse_duration(text:str):
+    """'5m'、'30s'、'1h'、'90'(秒) 轉成毫秒
+
+    Raises:
+        ValueError: 格式唔啱
+    """
+    units = {'h': 3600000, 'm': 60000, 's': 1000}
+    unit = units.get(text[-1:].lower())
+    number = text[:-1] if unit else text
+    value = float(number) * (unit or 1000)
+    if not math.isfinite(value):  # inf、nan 或者大到溢出
+        raise ValueError(f'時間唔啱: {text}')
+    return round(value)
+
+def parse_rule(spec:str):
+    """由文字建立規則, 用逗號分隔, 次序唔限
+
+    例如 'night,-5m'(任何一邊入夜前5分鐘)、'right,day'(右邊天光)、'night,all,once'、
+    'day,repeat=1.5'(天光期間每1.5秒響一次)
+
+    Raises:
+        ValueError: 格式唔啱
+    """
+    phase, sides, lead, repeat, once = None, 'any', 0, 0, False
+    for token in filter(None, (t.strip() for t in spec.split(','))):
+        key = token.lower()
+        if key in PHASES:
+            phase = PHASES[key]
+        elif key in SIDES:
+            sides = key
+        elif key == 'once':
+            once = True
+        elif key.startswith('repeat'):
+            repeat = parse_duration(key.partition('=')[2] or '1.5')
+        elif key.startswith('-'):
+            lead = parse_duration(key[1:])
+        else:
+            raise ValueError(f'唔識呢個提醒設定: {token}')
+    if phase is None:
+        raise ValueError(f'提醒規則要指定 night 或者 day: {spec}')
+    return AlertRule(phase, sides, lead, repeat, once)
+
+class AlertScheduler:
+    """提醒排程器
+
+    每條規則只會喺最小堆入面有一個下次響嘅時間, 響完先計下一次;
+    移除規則用懶刪除(堆入面嘅舊項目到堆頂先丟).
+    """
+    def __init__(self):
+        self._heap = []  # (現實時間, 序號, 規則)
+        self._pending = {}  # {規則: 排咗嘅時間}
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, rule:AlertRule):
+        return rule in self._pending
+
+    @property
+    def rules(self):
+        return list(self._pending)
+
+    def _schedule(self, rule:AlertRule, when):
+        if when is None:
+            self._pending[rule] = None  # 唔會再響, 但仍然算係有效規則
+            return
+        self._pending[rule] = when
+        heapq.heappush(self._heap, (when, next(self._order), rule))
+
+    def add(self, rule:AlertRule, current_time:int):
+        """加入規則, 由 current_time 開始計"""
+        self._schedule(rule, rule.next_fire(current_time))
+        return rule
+
+    def due(self, rule:AlertRule):
+        """規則下一次響嘅現實時間, 唔會再響或者唔喺排程入面就返回 None"""
+        return self._pending.get(rule)
+
+    def remove(self, rule:AlertRule):
+        self._pending.pop(rule, None)
+
+    def clear(self):
+        self._heap.clear()
+        self._pending.clear()
+
+    def rebuild(self, current_time:int):
+        """日夜時段(profile)改咗之後重新計過所有規則"""
+        rules = list(self._pending)
+        self.clear()
+        for rule in rules:
+            self.add(rule, current_time)
+
+    def next_due(self):
+        """最早要響嘅現實時間, 冇就返回 None"""
+        heap = self._heap
+        while heap:
+            when, _, rule = heap[0]
+            if self._pending.get(rule, -1) == when:
+                return when
+            heapq.heappop(heap)  # 已經移除或者重新排過
+        return None
+
+    def pop_due(self, current_time:int):
+        """攞出所有到咗時間嘅規則, 並且排好佢哋下一次
+
+        返回:
+            list[AlertRule]: 今次要響嘅規則
+        """
+        fired = []
+        while True:
+            when = self.next_due()
+            if when is None or when > current_time:
+                return fired
+            rule = heapq.heappop(self._heap)[2]
+            fired.append(rule)
+            if rule.once:
+                del self._pending[rule]
+            elif rule.repeat:
+                # 錯過咗幾次(例如電腦瞓咗)都只響一次, 由而家計下一次
+                self._schedule(rule, rule.next_fire(current_time + rule.repeat))
+            else:
+                self._schedule(rule, rule.next_entry(current_time + 1))
+
+class AlertSwitch:
+    """日/夜提醒開關(GUI 嘅日/夜按鈕、終端機嘅 d/n 鍵)
+
+    開住嘅時候任何一邊係白天/夜晚期間每 interval 秒響一次, 日同夜同一時間只可以開一個;
+    對應嘅規則同其他規則放喺同一個排程器.
+
+    參數:
+        scheduler (AlertScheduler): 規則放入呢個排程器
+        interval (float, optional): 響嘅間隔(秒), 預設值: 1.5.
+    """
+    def __init__(self, scheduler:AlertScheduler, interval:float=1.5):
+        self.scheduler = scheduler
+        self.interval = interval
+        self.phase = None  # 'light'、'night' 或者 None(冇開)
+        self.rule = None
+
+    @property
+    def day(self):
+        return self.phase == 'light'
+
+    @property
+    def night(self):
+        return self.phase == 'night'
+
+    def set(self, phase:str, current_time:int):
+        """開 'light'/'night' 提醒, None 就關咗佢"""
+        if self.rule is not None:
+            self.scheduler.remove(self.rule)
+            self.rule = None
+        self.phase = phase
+        if phase is not None:
+            self.rule = self.scheduler.add(AlertRule(phase, repeat=int(self.interval * 1000)), current_time)
+
+    def toggle(self, phase:str, current_time:int):
+        """開關 'light'/'night' 提醒, 開一個會關咗另一個"""
+        self.set(None if self.phase == phase else phase, current_time)
+
+    def status_text(self):
+        status = []
+        if self.day:
+            status.append('白天')
+        if self.night:
+            status.append('夜晚')
+        rules = len(self.scheduler) - (self.rule is not None)
+        if rules:
+            status.append(f'{rules}條規則')
+        return f'已啟用提醒: {" 和 ".join(status)}' if status else '等待設定提醒'
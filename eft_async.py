@@ -0,0 +1,126 @@
+# asyncio 介面: 每秒時間、日夜轉換同等待某個日夜狀態, 直接用公式計好嘅時間瞓覺,
+# 同一個事件循環入面所有等待者共用一個計時器
+
+import asyncio
+import heapq
+import time
+import weakref
+from eft_time import HORIZON, next_boundary, phase_transitions, phase_windows, time_info
+
+class TimerHub:
+    """一個事件循環共用嘅計時器
+
+    等待同一個時間嘅協程共用同一個 future, 成個循環任何時候都只有一個
+    call_later 排住(最早嗰個時間), 到時先喚醒到期嘅等待者再排下一個.
+    """
+    def __init__(self, loop:asyncio.AbstractEventLoop):
+        self.loop = loop
+        self._heap = []  # 等待中嘅現實時間(毫秒)
+        self._waiters = {}  # {現實時間: future}
+        self._handle = None
+        self._armed = None  # 而家排咗嘅時間
+        self.wakeups = 0  # 計時器實際醒咗幾多次
+
+    def __len__(self):
+        return len(self._waiters)
+
+    def wait_until(self, due:int):
+        """返回喺現實時間 due(毫秒) 完成嘅 future, 同一個時間共用同一個"""
+        future = self._waiters.get(due)
+        if future is None:
+            future = self._waiters[due] = self.loop.create_future()
+            heapq.heappush(self._heap, due)
+            if self._armed is None or due < self._armed:
+                self._arm(due)
+        return future
+
+    def _arm(self, due:int):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._armed = due
+        self._handle = self.loop.call_later(max(0.0, due / 1000 - time.time()), self._fire)
+
+    def _fire(self):
+        self.wakeups += 1
+        self._handle = self._armed = None
+        now = time.time() * 1000
+        heap = self._heap
+        while heap and heap[0] <= now:
+            due = heapq.heappop(heap)
+            future = self._waiters.pop(due)
+            if not future.done():
+                future.set_result(due)
+        if heap:
+            self._arm(heap[0])  # 醒早咗都係咁, 再排過
+
+_hubs = weakref.WeakKeyDictionary()
+
+def get_hub():
+    """獲取目前事件循環嘅 TimerHub, 冇就建立"""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = TimerHub(loop)
+    return hub
+
+async def sleep_until(due:int):
+    """瞓到現實時間 due(毫秒)
+
+    參數:
+        due (int): 現實時間(毫秒)
+
+    返回:
+        int: due
+    """
+    # shield: 一個等待者被取消唔會影響共用同一個 future 嘅其他等待者
+    return await asyncio.shield(get_hub().wait_until(due))
+
+async def ticks(interval:int=1000):
+    """每 interval 毫秒產生一次兩邊時間
+
+    處理得慢錯過咗嘅格會直接跳過, 唔會積埋.
+
+    參數:
+        interval (int, optional): 間隔(毫秒), 預設值: 1000.
+
+    返回:
+        AsyncIterator[dict]: 同 time_info() 一樣嘅內容, 對應整格嘅時間
+    """
+    while True:
+        due = next_boundary(int(time.time() * 1000), interval)
+        await sleep_until(due)
+        yield time_info(due)
+
+async def transitions(left:bool=None):
+    """每次日夜轉換產生一次
+
+    參數:
+        left (bool, optional): 只睇左邊(True)或者右邊(False), 預設值: None(兩邊).
+
+    返回:
+        AsyncIterator[tuple[int, str, str]]: (現實時間毫秒, 'left'/'right', 'night'/'light')
+    """
+    for event in phase_transitions(int(time.time() * 1000) + 1, None, left):
+        await sleep_until(event[0])
+        yield event
+
+async def wait_for_phase(side:str='any', phase:str='night'):
+    """等到指定日夜狀態, 已經係嘅話即刻返回
+
+    參數:
+        side (str, optional): 'any' 任何一邊、'all' 兩邊都係、'left' 或者 'right', 預設值: 'any'.
+        phase (str, optional): 'night' 或者 'light', 預設值: 'night'.
+
+    Raises:
+        ValueError: 參數唔啱, 或者而家嘅日夜時段永遠唔會去到呢個狀態
+
+    返回:
+        int: 進入狀態嘅現實時間(毫秒), 已經係嘅話就係而家
+    """
+    now = int(time.time() * 1000)
+    window = next(phase_windows(now, now + HORIZON, phase, side), None)
+    if window is None:
+        raise ValueError(f'{side} 永遠唔會去到 {phase}')
+    if window[0] > now:
+        await sleep_until(window[0])
+    return window[0]
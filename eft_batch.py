@@ -0,0 +1,277 @@
+# 批量轉換: 由 CSV / JSONL / Parquet 逐段讀入現實時間, 加上兩邊嘅塔科夫時間再寫出,
+# 記憶體入面最多得幾段數據; 大文件會分段交俾多個進程計
+
+import csv
+import json
+import os
+import sys
+from array import array
+from collections import deque
+from datetime import datetime, timedelta
+from eft_time import TarkovTime, _numpy, get_profile, get_tarkov_times, get_timezone, to_epoch_ms, use_profile
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+UNITS = {'s': 1000, 'ms': 1, 'us': 1e-3, 'ns': 1e-6}  # 換算成毫秒
+FIELDS = tuple(f'{side}_{name}' for side in ('left', 'right') for name in ('time', 'is_night', 'until_flip'))
+CHUNK_SIZE = 100_000  # 每段幾多行
+PARALLEL_SIZE = 64 * 1024 * 1024  # 文件大過呢個先用多進程
+
+_hms = None
+
+def _hms_table():
+    # 一日只有 86400 個塔科夫秒, 預先格式化好, 之後查表就得
+    global _hms
+    if _hms is None:
+        table = [str(TarkovTime(s)) for s in range(24 * 3600)]
+        np = _numpy()
+        _hms = np.array(table, dtype=object) if np is not None else table
+    return _hms
+
+def detect_format(path:str):
+    """由副檔名判斷格式
+
+    Raises:
+        ValueError: 唔識呢個副檔名
+    """
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f'唔識 {path} 嘅格式, 請用 --from/--to 指定 csv、jsonl 或者 parquet')
+    return fmt
+
+def _to_ms(values, tz, unit):
+    # 返回 (毫秒, 空白位置); 全部係數字就直接用 numpy 轉, 有 ISO 字串先逐個解析
+    np = _numpy()
+    if np is not None:
+        try:
+            number = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass
+        else:
+            missing = np.isnan(number)
+            return np.where(missing, 0, number * unit).astype(np.int64), np.flatnonzero(missing).tolist()
+    ms, missing = array('q'), []
+    for i, value in enumerate(values):
+        if value is None or value == '':
+            missing.append(i)
+            ms.append(0)
+        else:
+            ms.append(to_epoch_ms(value, tz, unit))
+    return ms, missing
+
+def convert_timestamps(values, tz=None, unit:str='ms'):
+    """將一段現實時間轉換為兩邊嘅塔科夫時間, 多進程時喺子進程入面執行
+
+    參數:
+        values: 時間戳(數字或者數字字串)、ISO 8601 字串或者 datetime, None/空白會保留為 None
+        tz (tzinfo|str, optional): 冇時區嘅時間用邊個時區, 預設值: None(本地時間).
+        unit (str, optional): 數字時間戳嘅單位 's'、'ms'、'us'、'ns', 預設值: 'ms'.
+
+    Raises:
+        ValueError: 時間格式唔啱
+
+    返回:
+        dict[str, list]: FIELDS 每一欄嘅值, 同輸入一樣長
+    """
+    ms, missing = _to_ms(values, get_timezone(tz), UNITS[unit])
+    table = _hms_table()
+    columns = {}
+    for side, left in (('left', True), ('right', False)):
+        seconds, night, until = get_tarkov_times(ms, left)
+        if isinstance(table, list):
+            columns[f'{side}_time'] = [table[s] for s in seconds]
+            columns[f'{side}_is_night'] = [bool(n) for n in night]
+        else:
+            columns[f'{side}_time'] = table[seconds].tolist()
+            columns[f'{side}_is_night'] = night.tolist()
+        columns[f'{side}_until_flip'] = until.tolist()
+    for column in columns.values():
+        for i in missing:
+            column[i] = None
+    return columns
+
+def _read_csv(f, column, chunk_size):
+    reader = csv.DictReader(f)
+    if column not in (reader.fieldnames or ()):
+        raise ValueError(f'CSV 冇 {column} 呢一欄')
+    rows = []
+    for row in reader:
+        rows.append(row)
+        if len(rows) == chunk_size:
+            yield rows, [r[column] for r in rows], None
+            rows = []
+    if rows:
+        yield rows, [r[column] for r in rows], None
+
+def _read_jsonl(f, column, chunk_size):
+    rows = []
+    for line in f:
+        if line.strip():
+            rows.append(json.loads(line))
+        if len(rows) == chunk_size:
+            yield rows, [r.get(column) for r in rows], None
+            rows = []
+    if rows:
+        yield rows, [r.get(column) for r in rows], None
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _localize(wall, tz):
+    # 冇時區嘅時間(當地牆鐘毫秒, NaN 係空白)轉成現實時間; 同一分鐘嘅 UTC 偏移一樣,
+    # 所以每個唔同嘅分鐘先用 to_epoch_ms 計一次偏移, 同 CSV 逐個轉嘅結果一樣
+    np = _numpy()
+    wall = np.asarray(wall, dtype=np.float64)
+    minutes, inverse = np.unique(np.nan_to_num(wall) // 60000, return_inverse=True)
+    offsets = np.array([m * 60000 - to_epoch_ms(_EPOCH + timedelta(minutes=m), tz) for m in minutes.tolist()])
+    return wall - offsets[inverse]
+
+def _read_parquet(path, column, chunk_size, tz):
+    # 時間類型嘅欄直接轉成毫秒, 單位係 'ms'; 數字同字串欄嘅單位係 None(用 --unit)
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    tz = get_timezone(tz)
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        values = batch.column(column)
+        unit = None
+        if pa.types.is_timestamp(values.type):
+            unit, naive = 'ms', values.type.tz is None
+            values = values.cast(pa.timestamp('ms', tz=values.type.tz), safe=False).cast(pa.int64())
+            values = values.to_numpy(zero_copy_only=False)  # 有空白就係 float64 + NaN
+            if naive:
+                values = _localize(values, tz)
+        elif pa.types.is_integer(values.type) or pa.types.is_floating(values.type):
+            values = values.to_numpy(zero_copy_only=False)
+        else:
+            values = values.to_pylist()
+        yield batch, values, unit
+
+class _Writer:
+    """按格式將原本嘅記錄加埋轉換結果寫出"""
+    def __init__(self, fmt, f, path):
+        self.fmt = fmt
+        self.f = f
+        self.path = path
+        self._out = None
+
+    def write(self, rows, columns):
+        if self.fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pylist(rows) if isinstance(rows, list) else pa.Table.from_batches([rows])
+            for name in FIELDS:
+                table = table.append_column(name, pa.array(columns[name]))
+            if self._out is None:
+                self._out = pq.ParquetWriter(self.path, table.schema)
+            elif table.schema != self._out.schema:
+                table = table.cast(self._out.schema)  # JSONL 每段推斷出嚟嘅類型可能唔同
+            self._out.write_table(table)
+            return
+        if not isinstance(rows, list):
+            rows = rows.to_pylist()
+        for name, column in columns.items():
+            for row, value in zip(rows, column):
+                row[name] = value
+        if self.fmt == 'csv':
+            if self._out is None:
+                self._out = csv.DictWriter(self.f, [*rows[0], *(n for n in FIELDS if n not in rows[0])])
+                self._out.writeheader()
+            self._out.writerows(rows)
+        else:
+            self.f.writelines(json.dumps(row, ensure_ascii=False, default=str) + '\n' for row in rows)
+
+    def close(self):
+        if self.fmt == 'parquet' and self._out is not None:
+            self._out.close()
+
+def _open(path, mode):
+    if path == '-':
+        return sys.stdin if mode == 'r' else sys.stdout
+    return open(path, mode, newline='', encoding='utf-8')
+
+def convert_file(src:str, dst:str, column:str='timestamp', tz=None, unit:str='ms', workers:int=None,
+                 chunk_size:int=CHUNK_SIZE, src_format:str=None, dst_format:str=None):
+    """逐段轉換文件, 每行加上 left_time/left_is_night/left_until_flip 同右邊對應嘅欄
+
+    參數:
+        src (str): 輸入文件, '-' 代表 stdin
+        dst (str): 輸出文件, '-' 代表 stdout
+        column (str, optional): 時間所在嘅欄, 預設值: 'timestamp'.
+        tz (str, optional): 冇時區嘅時間用邊個時區, 例如 'Europe/Moscow', 預設值: None(本地時間).
+        unit (str, optional): 數字時間戳嘅單位 's'、'ms'、'us'、'ns', 預設值: 'ms'.
+        workers (int, optional): 進程數, 預設值: None(文件大過 PARALLEL_SIZE 就用晒 CPU, 否則單進程).
+        chunk_size (int, optional): 每段行數, 預設值: CHUNK_SIZE.
+        src_format (str, optional): 輸入格式, 預設值: None(睇副檔名).
+        dst_format (str, optional): 輸出格式, 預設值: None(睇副檔名, stdout 就同輸入一樣).
+
+    Raises:
+        ValueError: 格式、時區或者時間唔啱
+
+    返回:
+        int: 轉換咗幾多行
+    """
+    if unit not in UNITS:
+        raise ValueError(f'unit must be one of {", ".join(UNITS)}')
+    get_timezone(tz)  # 一開始就檢查時區, 唔好去到子進程先出錯
+    src_format = src_format or detect_format(src)
+    dst_format = dst_format or (src_format if dst == '-' else detect_format(dst))
+    if 'parquet' in (src_format, dst_format) and '-' in (src, dst):
+        raise ValueError('Parquet 唔支援 stdin/stdout')
+    if workers is None:
+        workers = (os.cpu_count() or 1) if src != '-' and os.path.getsize(src) >= PARALLEL_SIZE else 1
+
+    src_file = None if src_format == 'parquet' else _open(src, 'r')
+    dst_file = None if dst_format == 'parquet' else _open(dst, 'w')
+    if src_format == 'parquet':
+        chunks = _read_parquet(src, column, chunk_size, tz)
+    elif src_format == 'csv':
+        chunks = _read_csv(src_file, column, chunk_size)
+    else:
+        chunks = _read_jsonl(src_file, column, chunk_size)
+    writer = _Writer(dst_format, dst_file, dst)
+
+    converted = 0
+    try:
+        if workers <= 1:
+            for rows, values, chunk_unit in chunks:
+                writer.write(rows, convert_timestamps(values, tz, chunk_unit or unit))
+                converted += len(values)
+            return converted
+
+        from concurrent.futures import ProcessPoolExecutor
+        # 子進程用同一個日夜時段; 最多同時有 workers*2 段喺度計, 記憶體唔會隨文件變大
+        with ProcessPoolExecutor(workers, initializer=use_profile, initargs=(get_profile(),)) as pool:
+            pending = deque()
+            for rows, values, chunk_unit in chunks:
+                pending.append((rows, pool.submit(convert_timestamps, values, tz, chunk_unit or unit)))
+                converted += len(values)
+                if len(pending) >= workers * 2:
+                    rows, future = pending.popleft()
+                    writer.write(rows, future.result())
+            while pending:
+                rows, future = pending.popleft()
+                writer.write(rows, future.result())
+        return converted
+    finally:
+        writer.close()
+        for f in (src_file, dst_file):
+            if f not in (None, sys.stdin, sys.stdout):
+                f.close()
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='批量將現實時間轉換為塔科夫時間')
+    parser.add_argument('src', help='輸入文件(.csv/.jsonl/.parquet), - 代表 stdin')
+    parser.add_argument('dst', help='輸出文件, - 代表 stdout')
+    parser.add_argument('--column', '-c', default='timestamp', help='時間所在嘅欄，預設 timestamp')
+    parser.add_argument('--tz', help="冇時區嘅時間用邊個時區，例如 Europe/Moscow、UTC，預設本地時間")
+    parser.add_argument('--unit', choices=UNITS, default='ms', help='數字時間戳嘅單位，預設 ms')
+    parser.add_argument('--workers', '-j', type=int, help='進程數，預設大文件用晒 CPU')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f'每段行數，預設 {CHUNK_SIZE}')
+    parser.add_argument('--from', dest='src_format', choices=('csv', 'jsonl', 'parquet'), help='輸入格式，預設睇副檔名')
+    parser.add_argument('--to', dest='dst_format', choices=('csv', 'jsonl', 'parquet'), help='輸出格式，預設睇副檔名')
+    args = parser.parse_args()
+    try:
+        count = convert_file(args.src, args.dst, args.column, args.tz, args.unit, args.workers,
+                             args.chunk_size, args.src_format, args.dst_format)
+    except (ValueError, OSError) as e:
+        parser.exit(1, f'{e}\n')
+    print(f'已轉換 {count} 行', file=sys.stderr)
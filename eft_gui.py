@@ -0,0 +1,590 @@
+import os
+import time
+import tkinter as tk
+from collections import namedtuple
+from tkinter import ttk
+from tkinter import font
+from eft_alerts import AlertScheduler, AlertSwitch
+from eft_time import TarkovTime, TickClock, next_boundary, next_tarkov_second
+from sound_player import play_alert
+from tick_stats import NULL_STATS, StartupTimer, TickStats
+
+DEFAULT_FONT = 'Calibri'
+SideState = namedtuple('SideState', ('tarkov_time', 'is_night', 'countdown'))  # 每次更新每邊只計一次
+BUNDLED_FONT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MindEscape.ttf')  # 打包後都喺同一個目錄
+
+_font_families = {}  # {字體設定: 實際用到嘅字體名}, 成個進程共用
+_loaded_fonts = []  # tkextrafont 載入咗嘅字體, 保持引用
+
+def _actual_family(master, family:str):
+    # 直接問 Tk 呢個字體實際會用邊個 family, 唔使列出晒系統所有字體
+    return master.tk.call('font', 'actual', (family, 12), '-family')
+
+def resolve_font(master, spec:str=None):
+    """將字體設定解析為可以用嘅字體名, 每個設定喺成個進程只會解析(同載入)一次
+
+    參數:
+        master: 任何 Tk 元件
+        spec (str, optional): 字體名或者 .ttf/.otf 文件路徑, 預設值: None(DEFAULT_FONT).
+
+    返回:
+        str: 字體名, 載入失敗就係 Tk 代替嘅字體
+    """
+    spec = spec or DEFAULT_FONT
+    family = _font_families.get(spec)
+    if family is not None:
+        return family
+    is_file = spec.lower().endswith(('.ttf', '.otf'))
+    name = os.path.splitext(os.path.basename(spec))[0] if is_file else spec
+    family = _actual_family(master, name)
+    if is_file and family.lower() != name.lower():
+        # 系統冇裝(或者文件名唔係 family 名), 用 tkextrafont 由文件載入
+        fallback = family
+        try:
+            from tkextrafont import Font
+            loaded = Font(file=spec)
+            _loaded_fonts.append(loaded)
+            family = loaded.actual('family')  # 用 Tk 實際用緊嘅 family, 唔好估文件名
+            if family == fallback:
+                raise ValueError('Tk 冇用到文件入面嘅字體')
+        except Exception as e:
+            family = fallback
+            print(f"無法加載{name}字體: {e}，使用默認字體{family}")
+    _font_families[spec] = _font_families[family] = family
+    return family
+
+class FontCache:
+    """按字體大小緩存 tkinter.font.Font, 同一字體嘅所有標籤共用
+
+    每個大小只會建立一次 named font, 之後改大細只係換返已經解析好嘅字體.
+    """
+    _caches = {}
+
+    def __init__(self, family:str):
+        self.family = family
+        self._fonts = {}
+
+    @classmethod
+    def for_family(cls, family:str):
+        if family not in cls._caches:
+            cls._caches[family] = cls(family)
+        return cls._caches[family]
+
+    def get(self, size:int):
+        f = self._fonts.get(size)
+        if f is None:
+            f = self._fonts[size] = font.Font(family=self.family, size=size)
+        return f
+
+class TimeDisplay(ttk.Frame):
+    def __init__(self, master=None, font_name:str=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.fonts = FontCache.for_family(resolve_font(self, font_name))
+        self.resize_delay = 16  # 合併窗口大小變化嘅時間(毫秒), 大約一格畫面
+        self._resize_after = None
+        self._font_sizes = None  # 而家用緊嘅 (時間, 倒計時) 字體大小
+        self.font_reconfigs = 0  # 實際改咗幾多次字體
+        self._rendered = (None, None)  # 上次顯示嘅 (時間, 倒計時) 文字
+        self.tk_calls = 0  # 更新標籤文字嘅 Tk 調用次數
+        self.redraws = 0  # 內容有變嘅更新次數
+        self.create_widgets()
+        self.bind('<Configure>', self.on_resize)
+        self.min_width = 200  # 最小寬度
+        self.max_width = 800  # 最大寬度
+        self.min_font_size = 12  # 最小字體大小
+        self.max_font_size = 80  # 最大字體大小
+
+    def create_widgets(self):
+        # 時間顯示標籤
+        self.time_label = ttk.Label(
+            self,
+            font=self.fonts.get(16),
+            anchor='center'
+        )
+        self.time_label.pack(expand=True, fill='both', pady=5)
+
+        # 倒計時標籤
+        self.countdown_label = ttk.Label(
+            self,
+            font=self.fonts.get(12),
+            anchor='center'
+        )
+        self.countdown_label.pack(expand=True, fill='both', pady=5)
+
+    def calculate_font_size(self, widget_width):
+        # 根據窗口寬度計算字體大小
+        ratio = (widget_width - self.min_width) / (self.max_width - self.min_width)
+        ratio = max(0, min(1, ratio))  # 確保比例在0-1之間
+        font_size = self.min_font_size + (self.max_font_size - self.min_font_size) * ratio
+        return int(font_size)
+
+    def on_resize(self, event):
+        # 拖動窗口時會有大量 <Configure> 事件, 只處理一格畫面入面最後嗰個
+        if self._resize_after is not None:
+            self.after_cancel(self._resize_after)
+        self._resize_after = self.after(self.resize_delay, self.apply_resize)
+
+    def apply_resize(self):
+        self._resize_after = None
+        # 獲取當前Frame的寬度
+        width = self.winfo_width()
+        
+        # 計算新的字體大小
+        time_font_size = self.calculate_font_size(width)
+        countdown_font_size = max(int(time_font_size * 0.75), self.min_font_size)
+        if (time_font_size, countdown_font_size) == self._font_sizes:
+            return
+        self._font_sizes = (time_font_size, countdown_font_size)
+        
+        # 更新標籤字體
+        self.time_label.configure(font=self.fonts.get(time_font_size))
+        self.countdown_label.configure(font=self.fonts.get(countdown_font_size))
+        self.font_reconfigs += 1
+
+    def update_display(self, is_left=True, current_time=None):
+        tarkov_time = TarkovTime.at(is_left, current_time)# 獲取時間
+        self.show(SideState(tarkov_time, tarkov_time.is_night, tarkov_time.countdown_str()))
+        return tarkov_time, tarkov_time.is_night
+
+    def show(self, state:SideState):
+        # 由 MainWindow 每次更新推送, 時間同倒數已經計好
+        self.render((
+            f'{"🌙" if state.is_night else "🌞"} {state.tarkov_time}',
+            f'距離{"白天" if state.is_night else "夜晚"}還有: {state.countdown}'# 倒計時
+        ))
+
+    def render(self, view):
+        # 同上次顯示嘅內容比較, 只更新有變嘅標籤
+        time_text, countdown_text = view
+        last_time, last_countdown = self._rendered
+        if time_text != last_time:
+            self.time_label.config(text=time_text)
+            self.tk_calls += 1
+        if countdown_text != last_countdown:
+            self.countdown_label.config(text=countdown_text)
+            self.tk_calls += 1
+        if view != self._rendered:
+            self.redraws += 1
+        self._rendered = view
+
+class CanvasSide:
+    """單一 Canvas 上面其中一邊嘅時鐘, 接口同 TimeDisplay 一樣
+
+    圖示、時間同倒數都係預先建立好嘅文字項目, 更新只係 itemconfigure 有變嘅項目.
+    """
+    def __init__(self, canvas, x:float):
+        self.canvas = canvas
+        width, height = canvas.size
+        self.items = (
+            canvas.create_text(x * width, height * 0.25, font=canvas.time_font, fill='white'),  # 圖示
+            canvas.create_text(x * width, height * 0.5, font=canvas.time_font, fill='white'),  # 時間
+            canvas.create_text(x * width, height * 0.75, font=canvas.countdown_font, fill='white')  # 倒數
+        )
+        self._rendered = (None, None, None)  # 上次顯示嘅 (圖示, 時間, 倒計時) 文字
+        self.tk_calls = 0  # itemconfigure 次數
+        self.redraws = 0  # 內容有變嘅更新次數
+        self.font_reconfigs = 0  # 字體由 ClockCanvas 統一改, 呢度永遠係 0
+
+    def update_display(self, is_left=True, current_time=None):
+        tarkov_time = TarkovTime.at(is_left, current_time)
+        self.show(SideState(tarkov_time, tarkov_time.is_night, tarkov_time.countdown_str()))
+        return tarkov_time, tarkov_time.is_night
+
+    def show(self, state:SideState):
+        self.render((
+            '🌙' if state.is_night else '🌞',
+            str(state.tarkov_time),
+            f'距離{"白天" if state.is_night else "夜晚"}還有: {state.countdown}'
+        ))
+
+    def render(self, view):
+        # 只 itemconfigure 有變嘅項目
+        for item, text, last in zip(self.items, view, self._rendered):
+            if text != last:
+                self.canvas.itemconfigure(item, text=text)
+                self.tk_calls += 1
+        if view != self._rendered:
+            self.redraws += 1
+        self._rendered = view
+
+class ClockCanvas(tk.Canvas):
+    """用一個 Canvas 畫晒兩邊(或者其中一邊)時鐘, 唔使經 ttk 樣式同標籤排版
+
+    改變大小時用 scale() 一次過搬晒所有項目, 字體大小就改兩個共用嘅 named font,
+    所有項目會一齊跟住變, 唔使逐個標籤換字體.
+    """
+    def __init__(self, master=None, font_name:str=None, sides:tuple=(True, False), **kwargs):
+        self.size = (200 * len(sides), 200)  # 項目座標對應嘅 Canvas 大小
+        super().__init__(master, width=self.size[0], height=self.size[1], bg='#1a1a1a',
+                         highlightthickness=0, **kwargs)
+        family = resolve_font(self, font_name)
+        self.time_font = font.Font(family=family, size=16)
+        self.countdown_font = font.Font(family=family, size=12)
+        self.resize_delay = 16  # 合併窗口大小變化嘅時間(毫秒), 大約一格畫面
+        self._resize_after = None
+        self._font_sizes = None  # 而家用緊嘅 (時間, 倒計時) 字體大小
+        self.font_reconfigs = 0  # 實際改咗幾多次字體
+        self.min_width = 200  # 每邊最小寬度
+        self.max_width = 800  # 每邊最大寬度
+        self.min_font_size = 12  # 最小字體大小
+        self.max_font_size = 80  # 最大字體大小
+        # 每邊平均分闊度, sides 入面 True 係左邊
+        self.sides = [(is_left, CanvasSide(self, (i + 0.5) / len(sides))) for i, is_left in enumerate(sides)]
+        self.bind('<Configure>', self.on_resize)
+
+    calculate_font_size = TimeDisplay.calculate_font_size
+    on_resize = TimeDisplay.on_resize
+
+    def apply_resize(self):
+        self._resize_after = None
+        width, height = self.winfo_width(), self.winfo_height()
+        if (width, height) != self.size and width > 1 and height > 1:
+            self.scale('all', 0, 0, width / self.size[0], height / self.size[1])
+            self.size = (width, height)
+
+        # 每邊平均分闊度, 字體大小同標籤版一樣計
+        time_font_size = self.calculate_font_size(width / len(self.sides))
+        countdown_font_size = max(int(time_font_size * 0.75), self.min_font_size)
+        if (time_font_size, countdown_font_size) == self._font_sizes:
+            return
+        self._font_sizes = (time_font_size, countdown_font_size)
+        self.time_font.configure(size=time_font_size)
+        self.countdown_font.configure(size=countdown_font_size)
+        self.font_reconfigs += 1
+
+LAYOUT_SIDES = {'both': (True, False), 'left': (True,), 'right': (False,)}
+
+def build_displays(master, renderer:str='label', sides:str='both', font_name:str=None):
+    """建立時鐘顯示並 pack 落 master
+
+    參數:
+        master: 放顯示嘅容器
+        renderer (str, optional): 'label' 或者 'canvas', 預設值: 'label'.
+        sides (str, optional): 'both'、'left' 或者 'right', 預設值: 'both'.
+        font_name (str, optional): 字體名或者字體文件, 預設值: None.
+
+    返回:
+        tuple[ClockCanvas|None, list[tuple[bool, TimeDisplay|CanvasSide]]]: (Canvas, [(是否左邊, 顯示)])
+    """
+    if renderer == 'canvas':
+        canvas = ClockCanvas(master, font_name, LAYOUT_SIDES[sides])
+        canvas.pack(expand=True, fill='both')
+        return canvas, canvas.sides
+    displays = []
+    for is_left in LAYOUT_SIDES[sides]:
+        display = TimeDisplay(master, font_name)
+        display.pack(side='left' if is_left else 'right', expand=True, fill='both', padx=5)
+        displays.append((is_left, display))
+    return None, displays
+
+def parse_layout(spec:str):
+    """由文字建立額外窗口嘅設定, 用逗號分隔, 次序唔限
+
+    例如 'canvas,overlay'(無邊框置頂嘅 Canvas 窗口)、'left'(只顯示左邊)
+
+    Raises:
+        ValueError: 格式唔啱
+
+    返回:
+        dict: ClockWindow 嘅參數
+    """
+    layout = {}
+    for token in filter(None, (t.strip().lower() for t in (spec or '').split(','))):
+        if token in ('label', 'canvas'):
+            layout['renderer'] = token
+        elif token in LAYOUT_SIDES:
+            layout['sides'] = token
+        elif token == 'overlay':
+            layout['overlay'] = True
+        else:
+            raise ValueError(f'唔識呢個窗口設定: {token}')
+    return layout
+
+class ClockWindow(tk.Toplevel):
+    """額外嘅時鐘窗口(例如第二個熒幕或者直播疊加層)
+
+    自己唔計時間亦唔響鐘, 由 MainWindow 每次更新推送計好嘅狀態, 所以多開窗口只係多咗重畫.
+    overlay 係無邊框置頂窗口, 拖動可以移動, 撳 Esc 或者右鍵關閉.
+    """
+    def __init__(self, hub, renderer:str='label', sides:str='both', overlay:bool=False, font_name:str=None):
+        super().__init__(hub)
+        self.hub = hub
+        self.title('EFT Timer')
+        self.configure(bg='#1a1a1a')
+        if overlay:
+            self.overrideredirect(True)
+            self.attributes('-topmost', True)
+            self.bind('<ButtonPress-1>', self.start_move)
+            self.bind('<B1-Motion>', self.move)
+            self.bind('<Button-3>', lambda event: self.destroy())
+        self.bind('<Escape>', lambda event: self.destroy())
+        self._drag = (0, 0)
+        frame = ttk.Frame(self)
+        frame.pack(expand=True, fill='both', padx=5, pady=5)
+        self.canvas, self.displays = build_displays(frame, renderer, sides, font_name or hub.font_name)
+        self.bind('<Destroy>', self.on_destroy)
+
+    def start_move(self, event):
+        # 綁定喺 Toplevel 嘅事件子元件都會收到, event.x/y 係相對子元件, 所以用螢幕座標計返相對窗口
+        self._drag = (event.x_root - self.winfo_rootx(), event.y_root - self.winfo_rooty())
+
+    def move(self, event):
+        self.geometry(f'+{event.x_root - self._drag[0]}+{event.y_root - self._drag[1]}')
+
+    def on_destroy(self, event):
+        if event.widget is self:
+            self.hub.remove_window(self)
+
+class MainWindow(tk.Tk):
+    def __init__(self, maximize=False, update_interval=1, precise=False, show_drift=False, stats_path=None, shm_path=None, rules=(),
+                 font_name=None, startup=None, show_startup=False, renderer='label'):
+        self.startup = startup or StartupTimer()  # 啟動各階段用咗幾耐
+        self.startup.mark('imports')
+        super().__init__()
+        self.startup.mark('tk')
+        self.show_startup = show_startup  # 第一次畫好之後打印啟動時間
+
+        self.title('EFT Timer')
+        self.minsize(400, 240)  # 最小窗口大小
+        self.configure(bg='#1a1a1a')
+        
+        if maximize:
+            self.state('zoomed')  # 最大化窗口
+        
+        # 初始化提醒狀態
+        self.update_interval = max(1, min(update_interval, 60))  # 更新間隔限制
+        self.alert_interval = 1.5  # 提醒音觸發間隔（秒）
+        self.precise = precise  # 毫秒精度, 時鐘每個塔科夫秒更新一次
+        self.show_drift = show_drift  # 定時打印排程誤差
+        self.clock = TickClock()  # 對準牆鐘排程
+        self._after_id = None  # 下一次更新嘅 after id
+        self.stats_path = stats_path  # 統計 JSON 輸出位置
+        self.stats = NULL_STATS
+        self.publisher = None  # 共享記憶體發佈
+        if shm_path:
+            from eft_shm import StatePublisher
+            self.publisher = StatePublisher(shm_path)
+        self.last_alert_time = 0  # 上次提醒觸發時間
+        self.alerts = AlertScheduler()  # 所有提醒規則, 按下次響嘅時間排
+        self.switch = AlertSwitch(self.alerts, self.alert_interval)  # 日/夜按鈕
+        for rule in rules:
+            self.alerts.add(rule, int(time.time() * 1000))
+
+        # 深色主題
+        style = ttk.Style()
+        style.configure('TFrame', background='#1a1a1a')
+        style.configure('TLabel', background='#1a1a1a', foreground='white')
+        style.configure('TButton', background='#2a2a2a', foreground='black')
+        style.configure('Active.TButton', background='#3d3d3d', foreground='black')
+        style.configure('TStatusbar.TFrame', background='#2a2a2a')
+        style.configure('TStatusbar.TLabel', background='#2a2a2a', foreground='white')
+
+        main_frame = ttk.Frame(self)
+        main_frame.pack(expand=True, fill='both', padx=10, pady=10)
+
+        self.font_name = resolve_font(self, font_name)
+        self.startup.mark('font')
+
+        # 兩邊時間顯示, 'canvas' 就用單一 Canvas 畫晒兩邊
+        self.canvas, displays = build_displays(main_frame, renderer, 'both', self.font_name)
+        (_, self.left_display), (_, self.right_display) = displays
+        self.subscribers = list(displays)  # 每次更新推送狀態嘅 [(是否左邊, 顯示)]
+        self.windows = []  # 額外窗口, 同主窗口共用同一次計算同提醒
+        self._states = None  # 上次推送嘅 (左邊, 右邊) 狀態
+
+        # 創建狀態欄
+        self.status_frame = ttk.Frame(self, style='TStatusbar.TFrame')
+        self.status_frame.pack(side='bottom', fill='x', pady=(5, 0))
+
+        # 創建按鈕
+        self.day_button = ttk.Button(
+            self.status_frame,
+            text='日',
+            command=self.toggle_day_alert,
+            style='TButton',
+            width=3
+        )
+        self.day_button.pack(side='left', padx=5, pady=5)
+
+        self.night_button = ttk.Button(
+            self.status_frame,
+            text='夜',
+            command=self.toggle_night_alert,
+            style='TButton',
+            width=3,
+        )
+        self.night_button.pack(side='left', padx=5, pady=5)
+
+        self.stop_button = ttk.Button(
+            self.status_frame,
+            text='⏹',
+            command=self.stop_alert,
+            style='TButton',
+            width=3
+        )
+        self.stop_button.pack(side='right', padx=5, pady=5)
+
+        # 狀態標籤
+        self.status_label = ttk.Label(
+            self.status_frame,
+            text=self.status_text() if rules else '點擊左方的按鈕選擇提醒',
+            style='TStatusbar.TLabel'
+        )
+        self.status_label.pack(side='left', padx=5, pady=5)
+
+        # 隱藏嘅統計面板, 撳 F12 顯示
+        self.stats_label = ttk.Label(self.status_frame, style='TStatusbar.TLabel')
+        self.bind('<F12>', self.toggle_stats_panel)
+        if stats_path:
+            self.enable_stats()
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
+
+        self.startup.mark('widgets')
+
+        # 更新時間
+        self.update_time()
+        self.startup.mark('first_update')
+        self.after(0, self.first_paint)
+
+    def toggle_day_alert(self):
+        self.switch.toggle('light', int(time.time() * 1000))
+        self.update_buttons()
+
+    def toggle_night_alert(self):
+        self.switch.toggle('night', int(time.time() * 1000))
+        self.update_buttons()
+
+    def stop_alert(self):
+        self.switch.set(None, int(time.time() * 1000))
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.day_button.configure(style='Active.TButton' if self.switch.day else 'TButton')
+        self.night_button.configure(style='Active.TButton' if self.switch.night else 'TButton')
+        self.update_status_text()
+        self.reschedule()
+
+    def status_text(self):
+        return self.switch.status_text()
+
+    def update_status_text(self):
+        self.status_label.config(text=self.status_text())
+
+    def add_window(self, **layout):
+        """開一個額外嘅時鐘窗口, 參數同 ClockWindow 一樣(可以用 parse_layout 生成)
+
+        返回:
+            ClockWindow
+        """
+        window = ClockWindow(self, **layout)
+        self.windows.append(window)
+        self.subscribers += window.displays
+        if self._states is not None:
+            # 即刻顯示上次嘅狀態, 唔使等下一次更新
+            for is_left, display in window.displays:
+                display.show(self._states[0 if is_left else 1])
+        return window
+
+    def remove_window(self, window:ClockWindow):
+        if window in self.windows:
+            self.windows.remove(window)
+            self.subscribers = [s for s in self.subscribers if s not in window.displays]
+
+    def render_stats(self):
+        """返回所有顯示嘅 Tk 調用統計"""
+        displays = [display for _, display in self.subscribers]
+        canvases = [c for c in (self.canvas, *(w.canvas for w in self.windows)) if c is not None]
+        ticks = max(1, self.clock.ticks)
+        tk_calls = sum(d.tk_calls for d in displays)
+        redraws = sum(d.redraws for d in displays)
+        return {
+            'tk_calls': tk_calls,
+            'redraws': redraws,
+            'font_reconfigs': sum(d.font_reconfigs for d in (*displays, *canvases)),
+            'tk_calls_per_tick': round(tk_calls / ticks, 3),
+            'redraws_per_tick': round(redraws / ticks, 3)
+        }
+
+    def enable_stats(self):
+        if not self.stats.enabled:
+            self.stats = TickStats()
+
+    def toggle_stats_panel(self, event=None):
+        if self.stats_label.winfo_ismapped():
+            self.stats_label.pack_forget()
+            return
+        self.enable_stats()
+        self.stats_label.config(text=self.stats.summary())
+        self.stats_label.pack(side='right', padx=5, pady=5)
+
+    def first_paint(self):
+        # 處理埋所有等緊嘅重畫先算第一次畫好
+        self.update_idletasks()
+        self.startup.mark('first_paint')
+        if self.show_startup:
+            print(self.startup.report(), flush=True)
+
+    def on_close(self):
+        if self.stats_path:
+            self.stats.dump(self.stats_path)
+        self.destroy()
+        if self.publisher is not None:
+            self.publisher.close()
+
+    def reschedule(self):
+        # 提醒狀態改咗, 即刻重新計過下次更新時間
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self.clock.cancel()
+        self.update_time()
+
+    def update_time(self):
+        stats = self.stats
+        ticks = self.clock.ticks
+        now = self.clock.tick()
+        stats.start()
+        if self.clock.ticks != ticks:
+            stats.late(self.clock.last_drift)
+        clock_time = now if self.precise else now // 1000 * 1000  # 時鐘預設以整秒顯示
+        times = (TarkovTime.at(True, clock_time), TarkovTime.at(False, clock_time))
+        stats.lap('convert')
+        # 每邊只計一次, 再推送俾所有窗口嘅顯示
+        self._states = states = tuple(SideState(t, t.is_night, t.countdown_str()) for t in times)
+        if self.publisher is not None:
+            self.publisher.publish(now)
+        stats.lap('phase')
+        for is_left, display in self.subscribers:
+            display.show(states[0 if is_left else 1])
+        stats.lap('render')
+        # 提醒時間已經預先計好, 只需要攞出到咗時間嘅規則; 同一時間幾條規則或者
+        # 隔唔夠 alert_interval 都只響一次
+        fired = self.alerts.pop_due(now)
+        for rule in fired:
+            if now - self.last_alert_time >= self.alert_interval * 1000:
+                play_alert()
+                self.last_alert_time = now
+                stats.alert_fired()
+            else:
+                stats.alert_suppressed()
+        if any(rule.once for rule in fired):
+            self.update_status_text()  # 一次性規則響完會自動移除
+        stats.lap('alert')
+
+        # 下次更新: 時鐘下一格或者下一條提醒規則, 邊個早就邊個
+        if self.precise:
+            due = [next_tarkov_second(now)]
+        else:
+            due = [next_boundary(now, self.update_interval * 1000)]
+        alert_due = self.alerts.next_due()
+        if alert_due is not None:
+            due.append(alert_due)
+        if self.show_drift and self.clock.ticks and self.clock.ticks % 60 == 0:
+            print(f'drift: {self.clock.stats()}, render: {self.render_stats()}', flush=True)
+        if stats.enabled:
+            if self.stats_path not in (None, '-') and self.clock.ticks % 60 == 0:
+                stats.dump(self.stats_path)
+            if self.stats_label.winfo_ismapped():
+                self.stats_label.config(text=stats.summary())
+        self._after_id = self.after(self.clock.delay_until(min(due)), self.update_time)
+        stats.lap('schedule')
+        stats.end()
@@ -0,0 +1,305 @@
+# 本地推送服務: 客戶端訂閱主題, 日夜轉換或者提早提醒發生嗰陣先推送一行 JSON,
+# 唔使再不停輪詢 --api; 全部連接喺同一個 asyncio 循環入面處理
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import time
+from eft_alerts import AlertScheduler, parse_rule
+from eft_server import parse_address, remove_stale_socket
+from eft_time import phase_transitions, time_info
+
+if hasattr(socket, 'AF_UNIX'):
+    DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), 'eft_timer.sock')
+else:
+    DEFAULT_ADDRESS = '127.0.0.1:8766'
+MAX_BUFFER = 256 * 1024  # 客戶端未讀嘅數據超過呢個大小就斷開
+PHASE_SIDES = {'phase': None, 'phase,left': True, 'phase,right': False}
+
+def topic_of(spec:str):
+    """將訂閱文字轉成標準主題名, 意思一樣嘅寫法會得到同一個主題
+
+    例如 'night,-5m' 同 '-300s,any,night' 都係 'night,any,-300s'; 'phase'、'phase,left'、'phase,right'
+    係每次日夜轉換.
+
+    Raises:
+        ValueError: 格式唔啱
+
+    返回:
+        tuple[str, AlertRule|None]: (主題名, 規則), phase 主題冇規則
+    """
+    tokens = sorted(t.strip().lower() for t in spec.split(',') if t.strip())
+    if 'phase' in tokens:
+        topic = ','.join(['phase'] + [t for t in tokens if t != 'phase'])
+        if topic not in PHASE_SIDES:
+            raise ValueError(f'唔識呢個主題: {spec}')
+        return topic, None
+    rule = parse_rule(spec)
+    topic = f'{rule.phase},{rule.sides}'
+    if rule.lead:
+        topic += f',-{rule.lead / 1000:g}s'
+    if rule.repeat:
+        topic += f',repeat={rule.repeat / 1000:g}'
+    if rule.once:
+        topic += ',once'
+    return topic, rule
+
+class _Client:
+    __slots__ = ('writer', 'topics', 'task')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.topics = set()
+        self.task = asyncio.current_task()
+
+class PubSubServer:
+    """日夜轉換推送服務
+
+    所有訂閱共用一個 AlertScheduler, 同一個主題無論幾多客戶端都只排一次;
+    每個事件只 encode 一次再寫俾所有訂閱者. 寫入唔會等(唔 drain), 客戶端讀得太慢、
+    未讀數據超過 MAX_BUFFER 就直接斷開, 唔會拖慢其他人.
+
+    協議(每行一個 JSON):
+        {"subscribe": "night,-5m"}  ->  {"subscribed": "night,any,-300s", "next": 毫秒}
+        {"unsubscribe": "night,-5m"}  ->  {"unsubscribed": "night,any,-300s"}
+        {"time": null}  ->  同 --api 一樣嘅內容
+        推送: {"topic": ..., "time": 毫秒, ...}
+    """
+    def __init__(self, max_buffer:int=MAX_BUFFER):
+        self.max_buffer = max_buffer
+        self.clients = set()
+        self.topics = {}  # {主題: set[_Client]}
+        self.rules = {}  # {主題: 規則}
+        self._rule_topics = {}  # {規則: 主題}
+        self.scheduler = AlertScheduler()
+        self._phases = {}  # {主題: (下一次轉換, 轉換 iterator)}
+        self._changed = asyncio.Event()
+        self.published = 0  # 推送咗幾多個事件
+        self.dropped = 0  # 因為讀得太慢而斷開嘅客戶端
+
+    def _now(self):
+        return int(time.time() * 1000)
+
+    def _send(self, client:_Client, data:bytes):
+        writer = client.writer
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.dropped += 1
+            writer.transport.abort()  # 讀得太慢, 唔等佢讀完緩衝區, 即刻斷開
+            return
+        writer.write(data)
+
+    def _reply(self, client:_Client, message:dict):
+        self._send(client, json.dumps(message, ensure_ascii=False).encode() + b'\n')
+
+    def subscribe(self, client:_Client, spec:str):
+        topic, rule = topic_of(spec)
+        clients = self.topics.get(topic)
+        if clients is None:
+            clients = self.topics[topic] = set()
+            now = self._now()
+            if rule is None:
+                events = phase_transitions(now + 1, None, PHASE_SIDES[topic])
+                self._phases[topic] = (next(events, None), events)
+            else:
+                self.rules[topic] = self.scheduler.add(rule, now)
+                self._rule_topics[rule] = topic
+            self._changed.set()
+        clients.add(client)
+        client.topics.add(topic)
+        if topic in self.rules:
+            return topic, self.scheduler.due(self.rules[topic])
+        upcoming = self._phases[topic][0]
+        return topic, upcoming and upcoming[0]
+
+    def unsubscribe(self, client:_Client, topic:str):
+        client.topics.discard(topic)
+        clients = self.topics.get(topic)
+        if clients is None:
+            return
+        clients.discard(client)
+        if not clients:
+            self._drop_topic(topic)
+
+    def _drop_topic(self, topic:str):
+        del self.topics[topic]
+        self._phases.pop(topic, None)
+        rule = self.rules.pop(topic, None)
+        if rule is not None:
+            self.scheduler.remove(rule)
+            del self._rule_topics[rule]
+
+    def publish(self, topic:str, event:dict):
+        """將事件推送俾主題嘅所有訂閱者"""
+        clients = self.topics.get(topic)
+        if not clients:
+            return
+        data = json.dumps({'topic': topic, **event}, ensure_ascii=False).encode() + b'\n'
+        self.published += 1
+        for client in list(clients):
+            self._send(client, data)
+
+    def _next_due(self):
+        due = self.scheduler.next_due()
+        for upcoming, _ in self._phases.values():
+            if upcoming is not None and (due is None or upcoming[0] < due):
+                due = upcoming[0]
+        return due
+
+    def fire(self, now:int):
+        """推送所有到咗時間嘅事件"""
+        due = self.scheduler.next_due()
+        if due is not None and due <= now:
+            # 用 now 攞, 循環遲咗(例如電腦瞓咗)錯過嘅 repeat 都只會響一次; 事件時間用返原本排嘅時間
+            scheduled = {rule: self.scheduler.due(rule) for rule in self._rule_topics}
+            for rule in self.scheduler.pop_due(now):
+                topic = self._rule_topics[rule]
+                self.publish(topic, {'time': scheduled[rule], 'event': 'alert', 'rule': rule.name,
+                                     'phase': rule.phase, 'sides': rule.sides, 'lead': rule.lead})
+                if rule.once:  # 響完就冇咗, 訂閱者要重新訂閱
+                    for client in self.topics[topic]:
+                        client.topics.discard(topic)
+                    self._drop_topic(topic)
+        for topic, (upcoming, events) in list(self._phases.items()):
+            while upcoming is not None and upcoming[0] <= now:
+                t, side, phase = upcoming
+                self.publish(topic, {'time': t, 'event': 'phase', 'side': side, 'phase': phase})
+                upcoming = next(events, None)
+            self._phases[topic] = (upcoming, events)
+
+    async def run(self):
+        """排程循環: 瞓到下一個事件, 有新主題就醒嚟重新計"""
+        while True:
+            self._changed.clear()
+            due = self._next_due()
+            timeout = None if due is None else max(0, due - self._now()) / 1000
+            # 唔用 wait_for: 佢喺 event 啱啱 set 嗰陣收到 cancel 會食咗個 cancel, close() 就等唔返
+            changed = asyncio.ensure_future(self._changed.wait())
+            try:
+                done, _ = await asyncio.wait((changed,), timeout=timeout)
+            finally:
+                changed.cancel()
+            if not done:
+                self.fire(self._now())
+
+    async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter):
+        client = _Client(writer)
+        self.clients.add(client)
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                    if 'subscribe' in message:
+                        topic, upcoming = self.subscribe(client, str(message['subscribe']))
+                        self._reply(client, {'subscribed': topic, 'next': upcoming})
+                    elif 'unsubscribe' in message:
+                        topic, _ = topic_of(str(message['unsubscribe']))
+                        self.unsubscribe(client, topic)
+                        self._reply(client, {'unsubscribed': topic})
+                    elif 'time' in message:
+                        self._reply(client, time_info(message['time'] and int(message['time'])))
+                    else:
+                        raise ValueError('要有 subscribe、unsubscribe 或者 time')
+                except (ValueError, TypeError, AttributeError, OverflowError) as e:
+                    self._reply(client, {'error': str(e)})
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # 斷線或者行太長
+        finally:
+            self.clients.discard(client)
+            for topic in list(client.topics):
+                self.unsubscribe(client, topic)
+            writer.close()
+
+    async def start(self, address:str=DEFAULT_ADDRESS, backlog:int=1024):
+        """開始監聽, address 係 host:port 或者 Unix socket 路徑
+
+        參數:
+            address (str, optional): 監聽地址, 預設值: DEFAULT_ADDRESS.
+            backlog (int, optional): 未 accept 嘅連接隊列長度, 大量客戶端同時連入都唔會被拒, 預設值: 1024.
+
+        Raises:
+            FileExistsError: socket 路徑已經有其他文件
+            ValueError: 地址格式唔啱
+
+        返回:
+            asyncio.Server
+        """
+        address = parse_address(address)
+        if isinstance(address, str):
+            remove_stale_socket(address)
+            server = await asyncio.start_unix_server(self.handle, address, backlog=backlog)
+        else:
+            server = await asyncio.start_server(self.handle, *address, backlog=backlog)
+        self._task = asyncio.ensure_future(self.run())
+        return server
+
+    async def close(self):
+        """停止排程並斷開所有客戶端, 等每個連接正常收尾先返回"""
+        self._task.cancel()
+        tasks = [client.task for client in self.clients]
+        for client in list(self.clients):
+            client.writer.transport.abort()
+        await asyncio.gather(self._task, *tasks, return_exceptions=True)
+
+async def subscribe(address:str=DEFAULT_ADDRESS, *specs:str):
+    """客戶端: 連接推送服務並訂閱主題
+
+    參數:
+        address (str, optional): host:port 或者 Unix socket 路徑, 預設值: DEFAULT_ADDRESS.
+        *specs (str): 主題, 例如 'phase'、'night,-5m'、'right,day'
+
+    返回:
+        AsyncIterator[dict]: 服務器推送嘅每一行(包括 subscribed 回覆)
+    """
+    address = parse_address(address)
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+    try:
+        writer.write(b''.join(json.dumps({'subscribe': spec}).encode() + b'\n' for spec in specs))
+        await writer.drain()
+        async for line in reader:
+            yield json.loads(line)
+    finally:
+        writer.close()
+
+def serve(address:str=DEFAULT_ADDRESS):
+    """啟動推送服務, 一直運行到 Ctrl+C"""
+    async def _main():
+        pubsub = PubSubServer()
+        server = await pubsub.start(address)
+        print(f'EFT Timer publishing on {address}', flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await pubsub.close()  # 唔好留連接俾 asyncio.run 取消
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='EFT Timer 推送服務')
+    parser.add_argument('address', nargs='?', default=DEFAULT_ADDRESS, help='host:port 或者 Unix socket 路徑')
+    parser.add_argument('--subscribe', '-s', action='append', metavar='TOPIC',
+                        help="唔開服務器, 改為連接並打印訂閱到嘅事件, 例如 -s phase -s night,-5m")
+    args = parser.parse_args()
+    if args.subscribe:
+        async def _print():
+            async for message in subscribe(args.address, *args.subscribe):
+                print(json.dumps(message, ensure_ascii=False), flush=True)
+        try:
+            asyncio.run(_print())
+        except KeyboardInterrupt:
+            pass
+    else:
+        serve(args.address)
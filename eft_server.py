@@ -0,0 +1,156 @@
+# 本地 JSON 服務器: 長駐運行, 唔使每次查詢都開一個 --api 進程
+
+import json
+import os
+import socketserver
+import stat
+import time
+from itertools import islice
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from eft_time import phase_transitions, time_info
+
+MAX_TRANSITIONS = 1000  # 一次最多返回幾多次轉換, 防止一個請求食晒記憶體
+_cache = (None, {})  # (現實秒數, {query: 回應內容}), 只保留當前呢一秒
+
+def build_payload(query:str):
+    """根據查詢參數生成回應內容
+
+    參數:
+        query (str): URL 查詢字串, 支持:
+            time: 指定要轉換的現實時間(毫秒), 預設係而家
+            transitions: 一併返回之後幾多次日夜轉換(最多 MAX_TRANSITIONS), 預設 0
+
+    Raises:
+        ValueError: 參數唔啱
+
+    返回:
+        bytes: JSON 內容
+    """
+    global _cache
+    params = parse_qs(query)
+    current_time = int(params['time'][0]) if 'time' in params else None
+    count = int(params.get('transitions', ['0'])[0])
+    if count < 0:
+        raise ValueError('transitions must be >= 0')
+    if count > MAX_TRANSITIONS:
+        raise ValueError(f'transitions must be <= {MAX_TRANSITIONS}')
+
+    # 冇指定時間嘅查詢, 同一秒內用返同一個結果
+    second = int(time.time())
+    if current_time is None:
+        cached_second, cached = _cache
+        if cached_second != second:
+            cached = {}
+            _cache = (second, cached)
+        if query in cached:
+            return cached[query]
+        current_time = second * 1000  # 緩存嘅內容同緩存鍵用同一個時間, 唔好再讀多次時鐘
+
+    info = time_info(current_time)
+    if count:
+        info['transitions'] = [
+            {'time': t, 'side': side, 'phase': phase}
+            for t, side, phase in islice(phase_transitions(current_time + 1), count)
+        ]
+    body = json.dumps(info, ensure_ascii=False).encode('utf-8')
+    if 'time' not in params:
+        cached[query] = body
+    return body
+
+class TimeInfoHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 支持 keep-alive
+    wbufsize = -1  # 回應頭同內容一次過寫出, 避免 Nagle 加延遲
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path not in ('/', '/time'):
+            self._send(404, b'{"error": "not found"}')
+            return
+        try:
+            body = build_payload(url.query)
+        except ValueError as e:
+            self._send(400, json.dumps({'error': str(e)}).encode('utf-8'))
+            return
+        self._send(200, body)
+
+    def _send(self, code:int, body:bytes):
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 唔好每個請求都打印
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('local', 0)  # BaseHTTPRequestHandler 需要 (host, port)
+
+def parse_address(addr:str):
+    """分析服務地址, 包含 '/' 或者冇 ':' 嘅係 Unix socket 路徑, 其他係 host:port
+
+    Raises:
+        ValueError: port 唔係數字
+
+    返回:
+        str|tuple[str, int]: Unix socket 路徑或者 (host, port)
+    """
+    if '/' in addr or ':' not in addr:
+        return addr
+    host, port = addr.rsplit(':', 1)
+    return host, int(port)
+
+def remove_stale_socket(path:str):
+    """刪除上次運行留低嘅 Unix socket 文件, 唔存在就乜都唔做
+
+    Raises:
+        FileExistsError: 路徑係其他文件(唔係 socket), 唔會刪
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f'{path} 已經存在而且唔係 Unix socket')
+    os.unlink(path)
+
+def make_server(addr:str):
+    """建立服務器
+
+    參數:
+        addr (str): host:port 或者 Unix socket 路徑(包含 '/' 或者冇 ':')
+
+    Raises:
+        FileExistsError: socket 路徑已經有其他文件
+        ValueError: 地址格式唔啱
+
+    返回:
+        socketserver.BaseServer
+    """
+    address = parse_address(addr)
+    if isinstance(address, str):
+        remove_stale_socket(address)
+        return ThreadingUnixHTTPServer(address, TimeInfoHandler)
+    return ThreadingHTTPServer(address, TimeInfoHandler)
+
+def serve(addr:str='127.0.0.1:8765'):
+    """啟動服務器, 一直運行到 Ctrl+C"""
+    server = make_server(addr)
+    print(f'EFT Timer serving on {addr}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='EFT Timer JSON server')
+    parser.add_argument('addr', nargs='?', default='127.0.0.1:8765', help='host:port 或者 Unix socket 路徑')
+    serve(parser.parse_args().addr)
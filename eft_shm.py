@@ -0,0 +1,51 @@
+# 將計時器狀態發佈到共享記憶體(內存映射文件), 俾同一部機嘅其他進程直接讀
+# 讀取方面見 eft_shm_reader.py
+
+import mmap
+import os
+from eft_shm_reader import (DEFAULT_PATH, HEADER, MAGIC, PAYLOAD, PAYLOAD_OFFSET,
+                            SEQ, SEQ_OFFSET, SIZE, VERSION)
+from eft_time import TarkovTime, next_transition
+
+class StatePublisher:
+    """寫入端, 每次 publish 用 seqlock 方式更新: 序號變單數 -> 寫內容 -> 序號變雙數
+
+    Raises:
+        FileExistsError: path 已經有其他文件(唔係空文件亦唔係狀態文件), 唔會覆蓋
+    """
+    def __init__(self, path:str=DEFAULT_PATH):
+        self.path = path
+        # 唔好用 'w+b', 要睇過文件頭先決定覆唔覆蓋
+        self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), 'r+b')
+        head = self._file.read(HEADER.size)
+        if head and (len(head) < HEADER.size or HEADER.unpack(head)[:2] != (MAGIC, VERSION)):
+            self._file.close()
+            raise FileExistsError(f'{path} 已經存在而且唔係 EFT Timer 狀態文件')
+        self._file.truncate(SIZE)
+        self._mm = mmap.mmap(self._file.fileno(), SIZE)
+        HEADER.pack_into(self._mm, 0, MAGIC, VERSION, 0)
+        SEQ.pack_into(self._mm, SEQ_OFFSET, 0)
+        self._seq = 0
+        self._next = {True: None, False: None}  # 緩存兩邊嘅下一次轉換, 過咗先重新計; -1 即係冇轉換, 唔使再計
+
+    def _next_transition(self, left:bool, now:int):
+        cached = self._next[left]
+        if cached is None or 0 <= cached <= now:
+            transition = next_transition(left, now)
+            cached = self._next[left] = transition[0] if transition else -1
+        return cached
+
+    def publish(self, now:int):
+        """發佈現實時間 now(毫秒) 嘅狀態"""
+        left, right = TarkovTime.at(True, now), TarkovTime.at(False, now)
+        payload = (now, left.seconds, right.seconds, left.is_night, right.is_night,
+                   self._next_transition(True, now), self._next_transition(False, now))
+        mm = self._mm
+        SEQ.pack_into(mm, SEQ_OFFSET, self._seq + 1)
+        PAYLOAD.pack_into(mm, PAYLOAD_OFFSET, *payload)
+        self._seq += 2
+        SEQ.pack_into(mm, SEQ_OFFSET, self._seq)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
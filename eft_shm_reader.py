@@ -0,0 +1,84 @@
+# 讀取 EFT Timer 發佈喺共享記憶體(內存映射文件)入面嘅狀態
+# 只用標準庫, 可以直接抄去其他項目用
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections import namedtuple
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), 'eft_timer.shm')
+MAGIC = b'EFTT'
+VERSION = 1
+SIZE = 64
+
+# 佈局(小端):
+#   0  4s magic        4  H version       6  H 保留
+#   8  Q seq(序號, 單數代表寫緊)
+#   16 q epoch_ms      24 i left_seconds  28 i right_seconds
+#   32 B left_night    33 B right_night   34 2x 保留
+#   36 q left_next_ms  44 q right_next_ms(下一次日夜轉換, 冇就係 -1)
+HEADER = struct.Struct('<4sHH')
+SEQ = struct.Struct('<Q')
+SEQ_OFFSET = 8
+PAYLOAD = struct.Struct('<qiiBB2xqq')
+PAYLOAD_OFFSET = 16
+
+TimerState = namedtuple('TimerState', (
+    'seq', 'epoch_ms', 'left_seconds', 'right_seconds',
+    'left_night', 'right_night', 'left_next_ms', 'right_next_ms'
+))
+
+class StateReader:
+    """唔使鎖嘅讀取器(seqlock)
+
+    讀之前同讀完之後各讀一次序號, 兩次一樣而且係雙數先算讀到完整嘅狀態,
+    否則代表寫緊, 再讀過.
+    """
+    def __init__(self, path:str=DEFAULT_PATH):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), SIZE, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mm)
+        magic, version, _ = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'{path} 唔係 EFT Timer 狀態文件(version {VERSION})')
+
+    def read(self, retries:int=1000):
+        """讀取最新狀態
+
+        Raises:
+            TimeoutError: 試咗 retries 次都讀唔到完整狀態
+
+        返回:
+            TimerState|None: seq 係 0(未發佈過)就返回 None
+        """
+        buf = self._buf
+        for _ in range(retries):
+            before = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+            if not before & 1:
+                payload = PAYLOAD.unpack_from(buf, PAYLOAD_OFFSET)
+                if SEQ.unpack_from(buf, SEQ_OFFSET)[0] == before:
+                    if before == 0:
+                        return None
+                    epoch, left, right, left_night, right_night, left_next, right_next = payload
+                    return TimerState(before // 2, epoch, left, right,
+                                      bool(left_night), bool(right_night), left_next, right_next)
+            time.sleep(0)  # 寫入端寫緊, 讓出 CPU 俾佢寫完
+        raise TimeoutError('共享記憶體一直喺寫緊')
+
+    def close(self):
+        self._buf.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == '__main__':
+    import sys
+    with StateReader(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH) as reader:
+        print(reader.read())
@@ -0,0 +1,132 @@
+# 終端機介面: 冇顯示器嘅機器(例如跳板機)用, 同 GUI 用同一套時間計算
+
+import curses
+import locale
+import time
+from eft_alerts import AlertScheduler, AlertSwitch
+from eft_time import TarkovTime, TickClock, next_boundary
+
+KEYS = '[d]日  [n]夜  [s]停止  [q]退出'
+
+class TerminalTimer:
+    """curses 版計時器
+
+    只會喺下一秒或者下一條提醒規則到時先醒, 期間阻塞喺 getch 等按鍵,
+    重畫時只寫有變嘅行, 所以幾乎唔食 CPU.
+    """
+    def __init__(self, stdscr, update_interval=1, alert=None, publisher=None, rules=()):
+        self.stdscr = stdscr
+        self.update_interval = max(1, min(update_interval, 60))  # 更新間隔限制
+        self.alert = alert or curses.beep  # 預設用終端機響鈴, 經 SSH 都聽到
+        self.alert_interval = 1.5  # 提醒音觸發間隔（秒）
+        self.last_alert_time = 0  # 上次提醒觸發時間
+        self.clock = TickClock()
+        self.publisher = publisher  # 共享記憶體發佈
+        self._lines = {}  # 上次畫咗嘅內容 {行號: 文字}
+        self.alerts = AlertScheduler()
+        self.switch = AlertSwitch(self.alerts, self.alert_interval)  # d/n 鍵, 同 GUI 嘅按鈕一樣
+        for rule in rules:
+            self.alerts.add(rule, int(time.time() * 1000))
+
+    def toggle_day_alert(self):
+        self.switch.toggle('light', int(time.time() * 1000))
+
+    def toggle_night_alert(self):
+        self.switch.toggle('night', int(time.time() * 1000))
+
+    def stop_alert(self):
+        self.switch.set(None, int(time.time() * 1000))
+
+    def status_text(self):
+        return self.switch.status_text()
+
+    def put(self, row:int, text:str):
+        # 只重寫有變嘅行
+        if self._lines.get(row) == text:
+            return
+        self._lines[row] = text
+        try:
+            self.stdscr.move(row, 0)
+            self.stdscr.clrtoeol()
+            self.stdscr.addstr(row, 0, text)
+        except curses.error:
+            pass  # 終端機太細, 畫唔落就算
+
+    def draw(self, now:int):
+        clock_time = now // 1000 * 1000  # 時鐘以整秒顯示
+        self.put(0, 'EFT Timer')
+        for row, (name, is_left) in enumerate((('左', True), ('右', False)), start=2):
+            t = TarkovTime.at(is_left, clock_time)
+            self.put(row, f'{name}  {"夜" if t.is_night else "日"} {t}   '
+                          f'距離{"白天" if t.is_night else "夜晚"}還有: {t.countdown_str()}')
+        self.put(5, self.status_text())
+        self.put(6, KEYS)
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def check_alert(self, now:int):
+        """響到咗時間嘅提醒規則, 同一時間幾條規則都只響一次"""
+        if self.alerts.pop_due(now) and now - self.last_alert_time >= self.alert_interval * 1000:
+            self.alert()
+            self.last_alert_time = now
+
+    def handle_key(self, key:int):
+        """處理按鍵, 返回 False 代表退出"""
+        if key in (ord('q'), ord('Q'), 27):
+            return False
+        if key in (ord('d'), ord('D')):
+            self.toggle_day_alert()
+        elif key in (ord('n'), ord('N')):
+            self.toggle_night_alert()
+        elif key in (ord('s'), ord('S'), ord(' ')):
+            self.stop_alert()
+        elif key == curses.KEY_RESIZE:
+            self._lines.clear()
+            self.stdscr.erase()
+        return True
+
+    def run(self):
+        curses.curs_set(0)
+        while True:
+            now = self.clock.tick()
+            self.check_alert(now)
+            self.draw(now)
+            if self.publisher is not None:
+                self.publisher.publish(now)
+
+            # 下次更新: 時鐘下一格或者下一條提醒規則
+            due = [next_boundary(now, self.update_interval * 1000)]
+            alert_due = self.alerts.next_due()
+            if alert_due is not None:
+                due.append(alert_due)
+            self.stdscr.timeout(self.clock.delay_until(min(due)))
+            key = self.stdscr.getch()
+            if key == -1:
+                continue
+            self.clock.cancel()  # 俾按鍵叫醒, 唔計 drift
+            if not self.handle_key(key):
+                return
+
+def main(update_interval=1, wait_sun=False, wait_night=False, shm_path=None, rules=()):
+    """啟動終端機介面, 按 q 退出"""
+    locale.setlocale(locale.LC_ALL, '')
+    publisher = None
+    if shm_path:
+        from eft_shm import StatePublisher
+        publisher = StatePublisher(shm_path)
+
+    def _run(stdscr):
+        timer = TerminalTimer(stdscr, update_interval, publisher=publisher, rules=rules)
+        if wait_sun:
+            timer.toggle_day_alert()
+        elif wait_night:
+            timer.toggle_night_alert()
+        timer.run()
+
+    try:
+        curses.wrapper(_run)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if publisher is not None:
+            publisher.close()
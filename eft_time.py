@@ -3,28 +3,105 @@
 # For SvBot Project
 
 import time
-from datetime import datetime
+import heapq
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timezone, tzinfo
 
 TARKOV_RATIO = 7
+ONE_DAY = 24 * 3600 * 1000
+RUSSIA_OFFSET = 3 * 3600 * 1000
+SIDE_OFFSET = 12 * 3600 * 1000  # 右邊時間比左邊快12個鐘
 night_ranges = [(23*60, 24*60), (0, 4*60)]  # 定義夜晚時間範圍（從23:00到次日04:00，轉換為分鐘）
 
-def get_tarkov_time(left:bool=True, current_time:int=None):
+def get_tarkov_time(left:bool=True, current_time:int=None, precise:bool=False):
     """獲取塔科夫時間
 
     參數:
         left (bool, optional): 指定是否為左邊時間, 預設值: True.
         current_time (int, optional): 指定要轉換的時間, 預設值: None.
+        precise (bool, optional): 冇指定時間時用毫秒精度(唔截到整秒), 預設值: False.
 
     返回:
         str: 代表塔科夫時間的格式化字串
     """
+    return format_hms(tarkov_ms(left, current_time, precise))
+
+def tarkov_ms(left:bool=True, current_time:int=None, precise:bool=False):
+    """獲取塔科夫時間喺當日嘅毫秒數
+
+    參數:
+        left (bool, optional): 指定是否為左邊時間, 預設值: True.
+        current_time (int, optional): 指定要轉換的時間(毫秒), 預設值: None.
+        precise (bool, optional): 冇指定時間時用毫秒精度(唔截到整秒), 預設值: False.
+
+    返回:
+        int: 0 到 ONE_DAY 之間嘅毫秒數
+    """
     if current_time is None:
-        current_time = int(time.time()) * 1000
-    one_day = 24 * 3600 * 1000
-    russia = 3 * 3600 * 1000
-    offset = russia + (0 if left else 12 * 3600 * 1000)
-    tarkov_time = (offset + current_time * TARKOV_RATIO) % one_day
-    return format_hms(tarkov_time)
+        current_time = int(time.time() * 1000) if precise else int(time.time()) * 1000
+    offset = RUSSIA_OFFSET + (0 if left else SIDE_OFFSET)
+    return (offset + current_time * TARKOV_RATIO) % ONE_DAY
+
+class TarkovTime:
+    """塔科夫時間(當日秒數 + 左/右邊)
+
+    所有計算都喺整數入面做, 唔使格式化成字串再解析返出嚟
+    """
+    __slots__ = ('seconds', 'left')
+
+    def __init__(self, seconds:int, left:bool=True):
+        self.seconds = seconds % (24 * 3600)
+        self.left = left
+
+    @classmethod
+    def at(cls, left:bool=True, current_time:int=None, precise:bool=False):
+        """獲取指定現實時間(毫秒)嘅塔科夫時間, 預設係而家"""
+        return cls(tarkov_ms(left, current_time, precise) // 1000, left)
+
+    @classmethod
+    def from_str(cls, tarkov_time_str:str, left:bool=True):
+        """由 HH:MM:SS 字串建立"""
+        return cls(_parse_hms(tarkov_time_str), left)
+
+    @property
+    def is_night(self):
+        table = _table
+        if table is not None:
+            return table.night[self.seconds // table.step] == 1  # 直接索引, 唔經方法調用
+        return _profile.is_night(self.seconds)
+
+    @property
+    def phase(self):
+        """而家用緊嘅時段規則入面所屬嘅時段名"""
+        return _profile.phase(self.seconds)
+
+    @property
+    def next_phase(self):
+        return 'light' if self.is_night else 'night'
+
+    def countdown(self):
+        """距離下次日夜轉換嘅現實秒數"""
+        return seconds_until_change(self.seconds)
+
+    def countdown_str(self):
+        """距離下次日夜轉換嘅現實時間(HH:MM)"""
+        return format_hm(self.countdown())
+
+    def __str__(self):
+        s = self.seconds
+        return f"{s // 3600:02}:{s // 60 % 60:02}:{s % 60:02}"
+
+    def __repr__(self):
+        return f"TarkovTime('{self}', left={self.left})"
+
+    def __eq__(self, other):
+        if not isinstance(other, TarkovTime):
+            return NotImplemented
+        return self.seconds == other.seconds and self.left == other.left
+
+    def __hash__(self):
+        return hash((self.seconds, self.left))
 
 def format_hms(time):
     total = int(time / 1000)
@@ -33,16 +110,17 @@ def format_hms(time):
     secs = total % 60
     return f"{hours:02}:{mins:02}:{secs:02}"
 
-def real_time_to_tarkov_time(year:int, month:int, day:int, hour:int=0, minute:int=0, left:bool=True):
+def real_time_to_tarkov_time(year:int, month:int, day:int, hour:int=0, minute:int=0, left:bool=True, tz=None):
     """將指定的現實時間轉換為塔克夫時間
 
     參數:
-        year (int): 年
+        year (int): 年, 0 代表今年
         month (int): 月
         day (int): 天
         hour (int): 小時
         minute (int): 分鐘
         left (bool, optional): 指定是否為左邊時間, 預設值: True.
+        tz (tzinfo|str, optional): 時區, 例如 'Europe/Moscow'、'UTC', 預設值: None(本地時間).
 
     Raises:
         ValueError: 給出的時間不在指定範圍內
@@ -52,16 +130,285 @@ def real_time_to_tarkov_time(year:int, month:int, day:int, hour:int=0, minute:in
     """
     if not (1 <= month <= 12 and 1 <= day <= 31):
         raise ValueError("Invalid date values: month must be in 1-12, day must be in 1-31")
-    now = datetime.now()
-    target_date = datetime(year or now.year, month or now.month, day or now.day, hour, minute)
-    target_time = int((target_date - datetime(1970, 1, 1)).total_seconds() * 1000)
-    return get_tarkov_time(left,target_time)
+    if not year:
+        year = time.localtime().tm_year
+    target_date = datetime(year, month, day, hour, minute, tzinfo=get_timezone(tz))
+    return get_tarkov_time(left, int(target_date.timestamp() * 1000))
+
+def get_timezone(tz):
+    """將時區名稱轉換為 tzinfo
+
+    參數:
+        tz (tzinfo|str|None): 時區名稱(IANA, 例如 'Asia/Hong_Kong')、'UTC'、'local' 或者 tzinfo
+
+    Raises:
+        ValueError: 唔識呢個時區
+
+    返回:
+        tzinfo|None: None 代表本地時間
+    """
+    if tz is None or isinstance(tz, tzinfo):
+        return tz
+    if tz == 'local':
+        return None
+    if tz.upper() == 'UTC':
+        return timezone.utc
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f'Unknown time zone: {tz}') from None
+
+def to_epoch_ms(value, tz=None, unit:int=1):
+    """將時間戳(數字)或者 ISO 8601 字串轉換為現實時間(毫秒)
+
+    參數:
+        value (int|float|str|datetime): 時間
+        tz (tzinfo, optional): 冇時區嘅時間用邊個時區, 預設值: None(本地時間).
+        unit (int, optional): 數字時間戳嘅單位(毫秒), 例如秒就係 1000, 預設值: 1.
+
+    Raises:
+        ValueError: 格式唔啱
+
+    返回:
+        int: 現實時間(毫秒)
+    """
+    if isinstance(value, (int, float)):
+        return int(value * unit)
+    if isinstance(value, str):
+        try:
+            return int(float(value) * unit)
+        except ValueError:
+            value = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    if value.tzinfo is None and tz is not None:
+        value = value.replace(tzinfo=tz)
+    return int(value.timestamp() * 1000)
+
+class PhaseProfile:
+    """時段規則(例如唔同地圖或者活動有唔同嘅光照)
+
+    將一日分成多段有名嘅時段(例如 dawn/day/dusk/night), 編譯成排序好嘅邊界陣列,
+    用 bisect 查「而家係咩時段」、「下一個邊界」同倒數, 全部都係 O(log n).
+    """
+    __slots__ = ('name', 'starts', 'labels', 'night_labels', 'flips')
+
+    def __init__(self, name:str, intervals:list, default:str='light', night_labels:tuple=('night',)):
+        """
+        參數:
+            name (str): 規則名稱
+            intervals (list[tuple[int, int, str]]): (開始分鐘, 結束分鐘, 時段名),
+                結束細過開始代表跨過午夜, 重疊嘅話排前面嘅優先
+            default (str, optional): 冇覆蓋到嘅時間用嘅時段名, 預設值: 'light'.
+            night_labels (tuple, optional): 邊啲時段算係夜晚, 預設值: ('night',).
+        """
+        day = 24 * 60
+        pieces = []
+        for start, end, label in intervals:
+            start, end = start % day, (end if end == day else end % day)
+            if start < end:
+                pieces.append((start, end, label))
+            elif start > end:
+                pieces += [(start, day, label), (0, end, label)]
+        self.name = name
+        self.night_labels = frozenset(night_labels)
+        self.starts, self.labels = [], []
+        for point in sorted({0, *(p for s, e, _ in pieces for p in (s, e) if p < day)}):
+            label = next((l for s, e, l in pieces if s <= point < e), default)
+            if not self.labels or self.labels[-1] != label:
+                self.starts.append(point * 60)
+                self.labels.append(label)
+        if len(self.labels) > 1 and self.labels[0] == self.labels[-1]:
+            # 跨過午夜嘅時段: 最後一段同第一段係同一段
+            del self.starts[0], self.labels[0]
+
+        # 日夜轉換點: {None: 全部, True: 轉去夜晚, False: 轉去白天}
+        nights = [l in self.night_labels for l in self.labels]
+        changes = [(self.starts[i], nights[i]) for i in range(len(nights)) if nights[i] != nights[i - 1]]
+        self.flips = {None: [b for b, _ in changes]}
+        for to_night in (True, False):
+            self.flips[to_night] = [b for b, n in changes if n == to_night]
+
+    def _index(self, seconds:int):
+        # 第一段之前嘅時間會得到 -1, 即係跨過午夜嘅最後一段
+        return bisect_right(self.starts, seconds % (24 * 3600)) - 1
+
+    def phase(self, seconds:int):
+        """塔科夫時間(當日秒數)所屬嘅時段名"""
+        return self.labels[self._index(seconds)]
+
+    def is_night(self, seconds:int):
+        return self.labels[self._index(seconds)] in self.night_labels
+
+    def next_boundary(self, seconds:int):
+        """下一個時段邊界
+
+        返回:
+            tuple[int, str]|None: (邊界嘅塔科夫秒數, 可能超過一日, 新時段名), 成日都係同一時段就返回 None
+        """
+        if len(self.starts) < 2:
+            return None
+        j = (self._index(seconds) + 1) % len(self.starts)
+        b = self.starts[j]
+        return (b if b > seconds else b + 24 * 3600), self.labels[j]
+
+    def countdown(self, seconds:int):
+        """距離下一個時段邊界嘅現實秒數, 冇邊界就返回 None"""
+        boundary = self.next_boundary(seconds)
+        return None if boundary is None else (boundary[0] - seconds) // TARKOV_RATIO
+
+    def seconds_until_flip(self, seconds:int, to_night:bool=None):
+        """距離下一次日夜轉換嘅現實秒數, 冇轉換就返回 None"""
+        flips = self.flips[to_night]
+        if not flips:
+            return None
+        i = bisect_right(flips, seconds)
+        b = flips[i] if i < len(flips) else flips[0] + 24 * 3600
+        return (b - seconds) // TARKOV_RATIO
+
+profiles = {}
+
+def register_profile(profile:PhaseProfile):
+    """登記一個時段規則, 之後可以用名稱揀"""
+    profiles[profile.name] = profile
+    return profile
+
+DEFAULT_PROFILE = register_profile(PhaseProfile('default', [(s, e, 'night') for s, e in night_ranges]))
+_profile = DEFAULT_PROFILE
+
+def use_profile(profile='default'):
+    """揀用邊個時段規則, 所有日夜同倒數函數都會跟住用
+
+    參數:
+        profile (str|PhaseProfile, optional): 規則名稱或者規則, 預設值: 'default'.
+
+    Raises:
+        KeyError: 冇呢個名稱嘅規則
+
+    返回:
+        PhaseProfile
+    """
+    global _profile, _table
+    profile = profiles[profile] if isinstance(profile, str) else profile
+    # 先用新規則建好查表, 成功先一齊換, 唔會出現規則同查表唔一致
+    table = None if _table is None else CycleTable(_table.step, profile)
+    _profile, _table = profile, table
+    return _profile
+
+def get_profile():
+    """獲取而家用緊嘅時段規則"""
+    return _profile
 
 def in_night_range(minutes:int):
-    for start, end in night_ranges:
-        if start <= minutes < end:
-            return True
-    return False
+    return _profile.is_night(minutes * 60)
+
+def phase_boundaries():
+    """而家用緊嘅時段規則入面嘅日夜轉換時間點
+
+    返回:
+        list[tuple[int, bool]]: (當日秒數, 轉換後是否為夜晚), 按時間排序
+    """
+    return [(b, b in _profile.flips[True]) for b in _profile.flips[None]]
+
+def seconds_until_change(seconds:int, to_night:bool=None):
+    """計算由塔科夫時間(當日秒數)到下一次日夜轉換仲有幾多現實秒
+
+    參數:
+        seconds (int): 塔科夫時間嘅當日秒數
+        to_night (bool, optional): 只計轉去夜晚(True)或者白天(False)嘅轉換點, 預設值: None(任何轉換).
+
+    返回:
+        int|None: 現實秒數, 成日都唔會轉換就返回 None
+    """
+    table = _table
+    if to_night is None and table is not None and table.remaining is not None:
+        # 查表只用嚟計任何轉換; 指定方向嘅有一半要跳過下一個轉換, 用返 bisect 唔會慢過查表
+        step = table.step
+        return (table.remaining[seconds // step] - seconds % step) // TARKOV_RATIO
+    return _profile.seconds_until_flip(seconds, to_night)
+
+class CycleTable:
+    """預先計好塔科夫一日入面每一格嘅日夜同倒數, 查詢只需要索引一次
+
+    日夜轉換點一定喺整分鐘, 所以以分鐘為單位(step=60)都可以準確計到秒:
+    每格記住由格頭計起到下一次轉換嘅塔科夫秒數, 查詢時減返格內秒數再除 TARKOV_RATIO,
+    兩種單位用同一條式, TarkovTime.is_night 同 countdown 直接索引, 唔經方法調用.
+    以秒為單位(step=1)大約用 430KB, 以分鐘為單位大約用 7KB.
+    成日都唔會轉換嘅規則冇倒數, countdown() 返回 None.
+    """
+    __slots__ = ('step', 'night', 'remaining')
+
+    def __init__(self, step:int=1, profile:PhaseProfile=None):
+        """
+        參數:
+            step (int, optional): 1 以秒為單位, 60 以分鐘為單位, 預設值: 1.
+            profile (PhaseProfile, optional): 時段規則, 預設值: None(而家用緊嘅規則).
+        """
+        if step not in (1, 60):
+            raise ValueError("step must be 1 (second) or 60 (minute)")
+        profile = profile or _profile
+        self.step = step
+        size = 24 * 3600 // step
+        self.night = bytearray(profile.is_night(i * step // 60 * 60) for i in range(size))
+        boundaries = list(profile.flips[None])
+        if not boundaries:
+            self.remaining = None
+            return
+        boundaries.append(boundaries[0] + 24 * 3600)
+        self.remaining = array('i', bytes(4 * size))
+        i = 0
+        for n in range(size):
+            start = n * step
+            while boundaries[i] <= start:
+                i += 1
+            self.remaining[n] = boundaries[i] - start
+
+    def is_night(self, seconds:int):
+        return self.night[seconds // self.step] == 1
+
+    def countdown(self, seconds:int):
+        """距離下次日夜轉換嘅現實秒數, 冇轉換就返回 None"""
+        if self.remaining is None:
+            return None
+        return (self.remaining[seconds // self.step] - seconds % self.step) // TARKOV_RATIO
+
+    def nbytes(self):
+        if self.remaining is None:
+            return len(self.night)
+        return len(self.night) + self.remaining.itemsize * len(self.remaining)
+
+_table = None
+
+def use_cycle_table(step:int=1):
+    """啟用(或者停用)預先計好嘅查詢表, 之後 TarkovTime、is_night_time 同倒數函數都會查表
+
+    用 use_profile 換規則時會自動重新建表.
+
+    參數:
+        step (int, optional): 1 以秒為單位, 60 以分鐘為單位(慳記憶體), None 停用, 預設值: 1.
+
+    返回:
+        CycleTable|None
+    """
+    global _table
+    _table = None if step is None else CycleTable(step)
+    return _table
+
+def format_hm(seconds:int):
+    """將現實秒數格式化為 HH:MM, None 就返回 --:--"""
+    if seconds is None:
+        return '--:--'
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}"
+
+def _parse_hms(tarkov_time_str:str):
+    hours, minutes, seconds = map(int, tarkov_time_str.split(':'))
+    return hours * 3600 + minutes * 60 + seconds
+
+def _countdown(seconds:int, fstr:bool):
+    if seconds is None:
+        return None
+    if fstr:
+        return format_hm(seconds)
+    return seconds // 3600, seconds // 60 % 60
 
 def is_night_time(tarkov_time_str:str):
     """判斷時間是否為夜晚
@@ -72,15 +419,10 @@ def is_night_time(tarkov_time_str:str):
     返回:
         bool: 是否為夜晚
     """
-    # 將塔克夫時間分解為小時、分鐘和秒
     try:
-        hours, minutes, seconds = map(int, tarkov_time_str.split(':'))
+        return TarkovTime.from_str(tarkov_time_str).is_night
     except ValueError:
         return None
-    
-    # 將時間轉換為總分鐘數
-    total_minutes = int(hours * 60 + minutes + (seconds / 60))
-    return in_night_range(total_minutes)
 
 def time_until_night_ends(tarkov_time_str:str, fstr:bool=True)->str|tuple:
     """獲取距離夜晚結束還有多少時間
@@ -92,25 +434,8 @@ def time_until_night_ends(tarkov_time_str:str, fstr:bool=True)->str|tuple:
     返回:
         str|tuple
     """
-    # if not is_night_time(tarkov_time_str):
-        # return None
-    hours, minutes, seconds = map(int, tarkov_time_str.split(':'))
-    current_minutes = hours * 60 + minutes + (seconds / 60)
-    add_minutes = 0
-    if 23*60<=current_minutes<=24*60:
-        add_minutes = 60
-        current_minutes = 0
-    
-    time_left_minutes = 4*60 - current_minutes
-
-    time_left_minutes +=add_minutes
-    true_time = time_left_minutes / TARKOV_RATIO #轉換為現實時間
-    hours_left = int(true_time // 60)
-    minutes_left = int(true_time % 60)
-    if fstr:
-        return f"{hours_left:02d}:{minutes_left:02d}"
-    else:
-        return hours_left, minutes_left
+    seconds = _parse_hms(tarkov_time_str)
+    return _countdown(seconds_until_change(seconds, to_night=False), fstr)
 
 def time_until_night_starts(tarkov_time_str:str, fstr:bool=True):
     """獲取距離夜晚開始還有多少時間
@@ -122,27 +447,321 @@ def time_until_night_starts(tarkov_time_str:str, fstr:bool=True):
     返回:
         str|tuple
     """
-    # if is_night_time(tarkov_time_str):
-    #     return None
-    hours, minutes, seconds = map(int, tarkov_time_str.split(':'))
-    current_minutes = hours * 60 + minutes + (seconds / 60)
-    if 4*60<=current_minutes<=23*60:
-        time_left_minutes = 23*60 - current_minutes
-    else:
+    seconds = _parse_hms(tarkov_time_str)
+    if in_night_range(seconds // 60):
         return None
-    true_time = time_left_minutes / TARKOV_RATIO #轉換為現實時間
-    hours_left = int(true_time // 60)
-    minutes_left = int(true_time % 60)
-    if fstr:
-        return f"{hours_left:02d}:{minutes_left:02d}"
-    else:
-        return hours_left,minutes_left
+    return _countdown(seconds_until_change(seconds, to_night=True), fstr)
     
 def get_time_until_night(tarkov_time_str:str):
-    if is_night_time(tarkov_time_str):
-        return True, time_until_night_ends(tarkov_time_str)
+    t = TarkovTime.from_str(tarkov_time_str)
+    return t.is_night, t.countdown_str()
+
+def next_boundary(current_time:int, interval:int=1000):
+    """獲取下一個 interval 毫秒整數倍嘅現實時間(毫秒)"""
+    return (current_time // interval + 1) * interval
+
+def next_tarkov_second(current_time:int):
+    """獲取塔科夫時間下一次跳秒嘅現實時間(毫秒)"""
+    # 兩邊嘅偏移都係整秒, 所以 current_time * TARKOV_RATIO 過咗 1000 嘅倍數就會跳秒
+    k = current_time * TARKOV_RATIO // 1000 + 1
+    return -(-k * 1000 // TARKOV_RATIO)
+
+class TickClock:
+    """對準牆鐘嘅節拍器
+
+    每次都排到下一個絕對時間邊界, 而唔係喺上一次 callback 之後加固定延遲,
+    所以 callback 本身用嘅時間同 Tk 嘅排程誤差唔會累積.
+    延遲用 monotonic 時鐘量度, 記低每次實際遲咗幾多(drift).
+    """
+    def __init__(self):
+        self._deadline = None  # 預計觸發嘅 monotonic 時間(秒)
+        self.ticks = 0
+        self.last_drift = 0.0  # 毫秒
+        self.max_drift = 0.0
+        self.total_drift = 0.0
+
+    def tick(self):
+        """喺 callback 開頭叫, 記低今次遲咗幾多
+
+        返回:
+            int: 而家嘅現實時間(毫秒)
+        """
+        if self._deadline is not None:
+            drift = (time.monotonic() - self._deadline) * 1000
+            self.ticks += 1
+            self.last_drift = drift
+            self.max_drift = max(self.max_drift, abs(drift))
+            self.total_drift += abs(drift)
+            self._deadline = None
+        return int(time.time() * 1000)
+
+    def delay_until(self, due:int):
+        """計由而家到現實時間 due(毫秒) 要等幾多毫秒, 並記低預計觸發時間
+
+        參數:
+            due (int): 下一次要觸發嘅現實時間(毫秒)
+
+        返回:
+            int: 傳俾 after() 嘅延遲(毫秒), 最少 1
+        """
+        delay = max(1, -(-(due * 1000 - int(time.time() * 1e6)) // 1000))  # 向上取整, 唔好早過邊界
+        self._deadline = time.monotonic() + delay / 1000
+        return delay
+
+    def cancel(self):
+        """取消咗排好嘅 callback 時叫, 唔計今次 drift"""
+        self._deadline = None
+
+    def stats(self):
+        """返回 drift 統計(毫秒)"""
+        return {
+            'ticks': self.ticks,
+            'last': round(self.last_drift, 3),
+            'max': round(self.max_drift, 3),
+            'mean': round(self.total_drift / self.ticks, 3) if self.ticks else 0.0
+        }
+
+def _side_transitions(left:bool, start:int, end:int=None):
+    offset = RUSSIA_OFFSET + (0 if left else SIDE_OFFSET)
+    side = 'left' if left else 'right'
+    boundaries = [(b * 1000, 'night' if night else 'light') for b, night in phase_boundaries()]
+    if not boundaries:
+        return
+    cycle = (offset + start * TARKOV_RATIO) // ONE_DAY - 1
+    while True:
+        for b, phase in boundaries:
+            # 第一個令 (offset + t * TARKOV_RATIO) 去到 b 嘅整數毫秒
+            t = -(-(cycle * ONE_DAY + b - offset) // TARKOV_RATIO)
+            if t < start:
+                continue
+            if end is not None and t >= end:
+                return
+            yield t, side, phase
+        cycle += 1
+
+def phase_transitions(start:int=None, end:int=None, left:bool=None):
+    """直接由公式計出日夜轉換嘅現實時間, 唔使逐秒取樣
+
+    參數:
+        start (int, optional): 開始嘅現實時間(毫秒, 包括), 預設值: None(而家).
+        end (int, optional): 結束嘅現實時間(毫秒, 唔包括), 預設值: None(無限).
+        left (bool, optional): 只計左邊(True)或者右邊(False), 預設值: None(兩邊都計).
+
+    返回:
+        Iterator[tuple[int, str, str]]: 按時間排序嘅 (現實時間毫秒, 'left'/'right', 'night'/'light')
+    """
+    if start is None:
+        start = int(time.time() * 1000)
+    if left is not None:
+        return _side_transitions(left, start, end)
+    return heapq.merge(_side_transitions(True, start, end), _side_transitions(False, start, end))
+
+def next_transition(left:bool=True, current_time:int=None):
+    """獲取下一次日夜轉換
+
+    參數:
+        left (bool, optional): 指定是否為左邊時間, 預設值: True.
+        current_time (int, optional): 由邊個現實時間(毫秒)開始計, 預設值: None(而家).
+
+    返回:
+        tuple[int, str, str]|None: (現實時間毫秒, 'left'/'right', 'night'/'light'), 唔會轉換就返回 None
+    """
+    if current_time is None:
+        current_time = int(time.time() * 1000)
+    return next(_side_transitions(left, current_time + 1), None)
+
+def _side_countdown_changes(left:bool, start:int, end:int=None):
+    # 倒數(HH:MM)每跳一分鐘嘅時間: 倒數係 (轉換點 - 整數塔科夫秒) // 7, 所以塔科夫秒去到
+    # 轉換點前 420j-1 秒嗰下先由 j 分鐘變 j-1 分鐘; 轉換嗰下倒數會重新由下一段開始計
+    side = 'left' if left else 'right'
+    prev = start
+    for t, _, _ in _side_transitions(left, start):
+        # t 係轉換之後第一個整數毫秒, 塔科夫時間已經過咗轉換點 lag 毫秒(0-6)
+        lag = tarkov_ms(left, t) % 1000
+        shift = -(-(1000 - lag) // TARKOV_RATIO)
+        for j in range(-(-(t + shift - prev) // 60000) - 1, 0, -1):
+            change = t + shift - j * 60000
+            if end is not None and change >= end:
+                return
+            yield change, 'countdown', side, format_hm((j - 1) * 60)
+        if end is not None and t >= end:
+            return
+        yield t, 'countdown', side, TarkovTime.at(left, t).countdown_str()
+        prev = t
+
+def follow_events(start:int=None, end:int=None, kinds:tuple=('phase',)):
+    """按時間順序產生會令顯示改變嘅事件, 用嚟做 --follow 輸出
+
+    參數:
+        start (int, optional): 開始嘅現實時間(毫秒, 包括), 預設值: None(而家).
+        end (int, optional): 結束嘅現實時間(毫秒, 唔包括), 預設值: None(無限).
+        kinds (tuple, optional): 'phase' 日夜轉換、'countdown' 倒數每分鐘變化, 預設值: ('phase',).
+
+    返回:
+        Iterator[tuple[int, str, str, str]]: (現實時間毫秒, 事件類型, 'left'/'right', 新嘅值)
+    """
+    if start is None:
+        start = int(time.time() * 1000)
+    streams = []
+    for left in (True, False):
+        if 'phase' in kinds:
+            streams.append((t, 'phase', side, phase) for t, side, phase in _side_transitions(left, start, end))
+        if 'countdown' in kinds:
+            streams.append(_side_countdown_changes(left, start, end))
+    return heapq.merge(*streams)
+
+def union_windows(*streams):
+    """時間窗口嘅聯集
+
+    參數:
+        *streams: 多串按開始時間排序、互不重疊嘅 (開始, 結束) 窗口
+
+    返回:
+        Iterator[tuple[int, int]]: 按時間排序嘅聯集窗口, 相連嘅窗口會合併
+    """
+    current = None
+    for begin, end in heapq.merge(*streams):
+        if current is not None and begin <= current[1]:
+            current = (current[0], max(current[1], end))
+            continue
+        if current is not None:
+            yield current
+        current = (begin, end)
+    if current is not None:
+        yield current
+
+def intersect_windows(a, b):
+    """兩串時間窗口嘅交集
+
+    參數:
+        a, b: 按開始時間排序、互不重疊嘅 (開始, 結束) 窗口
+
+    返回:
+        Iterator[tuple[int, int]]: 按時間排序嘅交集窗口
+    """
+    a, b = iter(a), iter(b)
+    x, y = next(a, None), next(b, None)
+    while x is not None and y is not None:
+        begin, end = max(x[0], y[0]), min(x[1], y[1])
+        if begin < end:
+            yield begin, end
+        if x[1] < y[1]:
+            x = next(a, None)
+        else:
+            y = next(b, None)
+
+HORIZON = 2 * ONE_DAY // TARKOV_RATIO  # 搵下一次轉換最多睇兩個塔科夫日(現實時間)
+
+def _side_windows(left:bool, start:int, end:int, night:bool):
+    # 某一邊處於指定日夜狀態嘅窗口, 裁剪到 [start, end), 範圍係空或者倒轉就乜都冇
+    if start >= end:
+        return
+    opened = start if TarkovTime(tarkov_ms(left, start) // 1000).is_night == night else None
+    for t, _, phase in _side_transitions(left, start + 1, end):
+        if (phase == 'night') == night:
+            opened = t
+        elif opened is not None:
+            yield opened, t
+            opened = None
+    if opened is not None:
+        yield opened, end
+
+def phase_windows(start:int, end:int, phase:str='night', sides:str='any', min_length:int=0):
+    """計出一段現實時間入面有日/夜圖嘅時間窗口, 直接由轉換點計, 唔使逐秒取樣
+
+    參數:
+        start (int): 開始嘅現實時間(毫秒, 包括)
+        end (int): 結束嘅現實時間(毫秒, 唔包括), 唔大過 start 就冇窗口
+        phase (str, optional): 'night' 或者 'light', 預設值: 'night'.
+        sides (str, optional): 'any' 任何一邊、'all' 兩邊都係、'left' 或者 'right', 預設值: 'any'.
+        min_length (int, optional): 最短窗口長度(毫秒), 預設值: 0.
+
+    Raises:
+        ValueError: 參數唔啱
+
+    返回:
+        Iterator[tuple[int, int]]: 按時間排序嘅 (開始, 結束) 現實時間(毫秒)
+    """
+    if phase not in ('night', 'light'):
+        raise ValueError("phase must be 'night' or 'light'")
+    night = phase == 'night'
+    if sides == 'left':
+        windows = _side_windows(True, start, end, night)
+    elif sides == 'right':
+        windows = _side_windows(False, start, end, night)
+    elif sides == 'any':
+        windows = union_windows(_side_windows(True, start, end, night), _side_windows(False, start, end, night))
+    elif sides == 'all':
+        windows = intersect_windows(_side_windows(True, start, end, night), _side_windows(False, start, end, night))
+    else:
+        raise ValueError("sides must be 'any', 'all', 'left' or 'right'")
+    return (w for w in windows if w[1] - w[0] >= min_length)
+
+def time_info(current_time:int=None):
+    """獲取兩邊時間嘅資料(即係 --api 輸出嘅內容)
+
+    參數:
+        current_time (int, optional): 指定要轉換的時間(毫秒), 預設值: None(而家).
+
+    返回:
+        dict: {'left': {...}, 'right': {...}}
+    """
+    if current_time is None:
+        current_time = int(time.time()) * 1000
+    info = {}
+    for side, is_left in (('left', True), ('right', False)):
+        tarkov_time = TarkovTime.at(is_left, current_time)
+        info[side] = {
+            'time': str(tarkov_time),
+            'is_night': tarkov_time.is_night,
+            'next_phase': tarkov_time.next_phase,
+            'countdown': tarkov_time.countdown_str()
+        }
+    return info
+
+def _numpy():
+    # numpy 係可選依賴, 用到先載入(唔拖慢 import), 冇裝就用純Python計
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def get_tarkov_times(timestamps, left:bool=True, fstr:bool=False):
+    """批量將現實時間(毫秒)轉換為塔科夫時間, 一次過計晒日夜同倒數
+
+    參數:
+        timestamps: 現實時間(毫秒)嘅 numpy array、list 或者任何 int64 buffer
+        left (bool, optional): 指定是否為左邊時間, 預設值: True.
+        fstr (bool, optional): 是否額外返回 HH:MM:SS 字串, 預設值: False.
+
+    返回:
+        tuple: (當日秒數, 是否夜晚, 距離下次轉換嘅現實秒數[, 格式化字串])
+            有 numpy 就返回 ndarray, 冇就返回 array.array; 成日都唔會轉換嘅話倒數係 -1
+    """
+    offset = RUSSIA_OFFSET + (0 if left else SIDE_OFFSET)
+    profile = _profile
+    flips = profile.flips[None]
+    np = _numpy()
+    if np is not None:
+        ts = np.asarray(timestamps, dtype=np.int64)
+        seconds = (offset + ts * TARKOV_RATIO) % ONE_DAY // 1000
+        starts = np.array(profile.starts, dtype=np.int64)
+        nights = np.array([l in profile.night_labels for l in profile.labels], dtype=bool)
+        night = nights[np.searchsorted(starts, seconds, side='right') - 1]
+        if flips:
+            edges = np.array(flips + [flips[0] + 24 * 3600], dtype=np.int64)
+            nxt = edges[np.searchsorted(edges[:-1], seconds, side='right')]
+            until = (nxt - seconds) // TARKOV_RATIO
+        else:
+            until = np.full(seconds.shape, -1, dtype=np.int64)
     else:
-        return False, time_until_night_starts(tarkov_time_str)
+        seconds = array('q', ((offset + t * TARKOV_RATIO) % ONE_DAY // 1000 for t in timestamps))
+        night = array('b', (profile.is_night(s) for s in seconds))
+        until = array('q', (-1 if not flips else profile.seconds_until_flip(s) for s in seconds))
+    if fstr:
+        return seconds, night, until, [str(TarkovTime(s)) for s in seconds.tolist()]
+    return seconds, night, until
 
 if __name__ == "__main__":
     print("Left Time:", get_tarkov_time(True))
@@ -1,251 +1,153 @@
 import sys
-import tkinter as tk
-from tkinter import ttk
-from tkinter import font
-from datetime import datetime
-from eft_time import get_tarkov_time, is_night_time, get_time_until_night
-from sound_player import play_alert
-import argparse
+import time
+_started = time.perf_counter()  # 啟動報告由呢度開始計
+from eft_time import TarkovTime, follow_events, time_info, to_epoch_ms
 
-class TimeDisplay(ttk.Frame):
-    def __init__(self, master=None, **kwargs):
-        super().__init__(master, **kwargs)
-        self.custom_font = font.Font(family='Calibri')
-        self.create_widgets()
-        self.bind('<Configure>', self.on_resize)
-        self.min_width = 200  # 最小寬度
-        self.max_width = 800  # 最大寬度
-        self.min_font_size = 12  # 最小字體大小
-        self.max_font_size = 80  # 最大字體大小
+EVENT_KINDS = ('phase', 'countdown')  # --follow 支持嘅事件
 
-    def create_widgets(self):
-        # 時間顯示標籤
-        self.time_label = ttk.Label(
-            self,
-            font=(self.custom_font.name, 16),
-            anchor='center'
-        )
-        self.time_label.pack(expand=True, fill='both', pady=5)
-
-        # 倒計時標籤
-        self.countdown_label = ttk.Label(
-            self,
-            font=(self.custom_font.name, 12),
-            anchor='center'
-        )
-        self.countdown_label.pack(expand=True, fill='both', pady=5)
-
-    def calculate_font_size(self, widget_width):
-        # 根據窗口寬度計算字體大小
-        ratio = (widget_width - self.min_width) / (self.max_width - self.min_width)
-        ratio = max(0, min(1, ratio))  # 確保比例在0-1之間
-        font_size = self.min_font_size + (self.max_font_size - self.min_font_size) * ratio
-        return int(font_size)
-
-    def on_resize(self, event):
-        # 獲取當前Frame的寬度
-        width = self.winfo_width()
-        
-        # 計算新的字體大小
-        time_font_size = self.calculate_font_size(width)
-        countdown_font_size = max(int(time_font_size * 0.75), self.min_font_size)
-        
-        # 更新標籤字體
-        self.time_label.configure(font=(self.custom_font.name, time_font_size))
-        self.countdown_label.configure(font=(self.custom_font.name, countdown_font_size))
-
-    def update_display(self, is_left=True):
-        
-        time_str = get_tarkov_time(is_left)# 獲取時間
-        is_night = is_night_time(time_str)# 係唔係夜晚
-        
-        self.time_label.config(text=f'{"🌙" if is_night else "🌞"} {time_str}')
-
-        # 更新倒計時
-        status, countdown = get_time_until_night(time_str)
-        self.countdown_label.config(
-            text=f'距離{"白天" if status else "夜晚"}還有: {countdown}')
-        
-        return time_str, is_night
-
-class MainWindow(tk.Tk):
-    def __init__(self, maximize=False, update_interval=1):
-        super().__init__()
-
-        self.title('EFT Timer')
-        self.minsize(400, 240)  # 最小窗口大小
-        self.configure(bg='#1a1a1a')
-        
-        if maximize:
-            self.state('zoomed')  # 最大化窗口
-        
-        # 初始化提醒狀態
-        self.day_alert = False
-        self.night_alert = False
-        self.update_interval = max(1, min(update_interval, 60))  # 更新間隔限制
-        self.alert_interval = 1.5  # 提醒音觸發間隔（秒）
-        self.last_alert_time = 0  # 上次提醒觸發時間
-
-        # 深色主題
-        style = ttk.Style()
-        style.configure('TFrame', background='#1a1a1a')
-        style.configure('TLabel', background='#1a1a1a', foreground='white')
-        style.configure('TButton', background='#2a2a2a', foreground='black')
-        style.configure('Active.TButton', background='#3d3d3d', foreground='black')
-        style.configure('TStatusbar.TFrame', background='#2a2a2a')
-        style.configure('TStatusbar.TLabel', background='#2a2a2a', foreground='white')
-
-        main_frame = ttk.Frame(self)
-        main_frame.pack(expand=True, fill='both', padx=10, pady=10)
-
-        # 左側時間顯示
-        self.left_display = TimeDisplay(main_frame)
-        self.left_display.pack(side='left', expand=True, fill='both', padx=5)
-
-        # 右側時間顯示
-        self.right_display = TimeDisplay(main_frame)
-        self.right_display.pack(side='right', expand=True, fill='both', padx=5)
-
-        # 創建狀態欄
-        self.status_frame = ttk.Frame(self, style='TStatusbar.TFrame')
-        self.status_frame.pack(side='bottom', fill='x', pady=(5, 0))
-
-        # 創建按鈕
-        self.day_button = ttk.Button(
-            self.status_frame,
-            text='日',
-            command=self.toggle_day_alert,
-            style='TButton',
-            width=3
-        )
-        self.day_button.pack(side='left', padx=5, pady=5)
-
-        self.night_button = ttk.Button(
-            self.status_frame,
-            text='夜',
-            command=self.toggle_night_alert,
-            style='TButton',
-            width=3,
-        )
-        self.night_button.pack(side='left', padx=5, pady=5)
-
-        self.stop_button = ttk.Button(
-            self.status_frame,
-            text='⏹',
-            command=self.stop_alert,
-            style='TButton',
-            width=3
-        )
-        self.stop_button.pack(side='right', padx=5, pady=5)
-
-        # 狀態標籤
-        self.status_label = ttk.Label(
-            self.status_frame,
-            text='點擊左方的按鈕選擇提醒',
-            style='TStatusbar.TLabel'
-        )
-        self.status_label.pack(side='left', padx=5, pady=5)
-
-        # 更新時間
-        self.update_time()
-
-    def toggle_day_alert(self):
-        if self.night_alert:
-            self.night_alert = False
-            self.night_button.configure(style='TButton')
-        self.day_alert = not self.day_alert
-        self.day_button.configure(
-            style='Active.TButton' if self.day_alert else 'TButton'
-        )
-        self.update_status_text()
-
-    def toggle_night_alert(self):
-        if self.day_alert:
-            self.day_alert = False
-            self.day_button.configure(style='TButton')
-        self.night_alert = not self.night_alert
-        self.night_button.configure(
-            style='Active.TButton' if self.night_alert else 'TButton'
-        )
-        self.update_status_text()
-
-    def stop_alert(self):
-        if self.day_alert:
-            self.day_alert = False
-            self.day_button.configure(style='TButton')
-        if self.night_alert:
-            self.night_alert = False
-            self.night_button.configure(style='TButton')
-        self.update_status_text()
-
-    def update_status_text(self):
-        status = []
-        if self.day_alert:
-            status.append('白天')
-        if self.night_alert:
-            status.append('夜晚')
-        
-        if status:
-            self.status_label.config(text=f'已啟用提醒: {" 和 ".join(status)}')
-        else:
-            self.status_label.config(text='等待設定提醒')
+def get_time_info():
+    """獲取當前時間信息的JSON格式字符串"""
+    import json
+    return json.dumps(time_info(), ensure_ascii=False)
 
-    def update_time(self):
-        left_time, left_is_night = self.left_display.update_display(True)
-        right_time, right_is_night = self.right_display.update_display(False)
+def parse_time(value:str):
+    """將命令行嘅時間(毫秒時間戳或者 ISO 格式, 冇時區就當本地時間)轉換為毫秒"""
+    return to_epoch_ms(value)
 
-        current_time = datetime.now().timestamp()
-        if current_time - self.last_alert_time >= self.alert_interval:
-            if (self.day_alert and (not left_is_night or not right_is_night)):
-                play_alert()
-                self.last_alert_time = current_time
-            elif (self.night_alert and (left_is_night or right_is_night)):
-                play_alert()
-                self.last_alert_time = current_time
+def follow(since:int=None, until:int=None, kinds:tuple=('phase',), out=sys.stdout):
+    """以 JSON Lines 格式持續輸出事件, 事件之間直接睡到下一個事件, 唔會輪詢
 
-        self.after(self.update_interval * 1000, self.update_time)
+    過去嘅事件(例如 --since 指定嘅歷史範圍)會一次過輸出, 只會喺要等嘅時候先 flush.
 
-def get_time_info():
-    """獲取當前時間信息的JSON格式字符串"""
+    參數:
+        since (int, optional): 開始嘅現實時間(毫秒), 預設值: None(而家).
+        until (int, optional): 結束嘅現實時間(毫秒), 預設值: None(一直運行).
+        kinds (tuple, optional): 要輸出嘅事件類型, 預設值: ('phase',).
+        out (optional): 輸出, 預設值: sys.stdout.
+    """
     import json
-    left_time = get_tarkov_time(True)
-    right_time = get_tarkov_time(False)
-    left_is_night = is_night_time(left_time)
-    right_is_night = is_night_time(right_time)
-    left_status, left_countdown = get_time_until_night(left_time)
-    right_status, right_countdown = get_time_until_night(right_time)
-    
-    json_str = json.dumps({
-        'left': {
-            'time': left_time,
-            'is_night': left_is_night,
-            'next_phase': 'light' if left_status else 'night',
-            'countdown': left_countdown
-        },
-        'right': {
-            'time': right_time,
-            'is_night': right_is_night,
-            'next_phase': 'light' if right_status else 'night',
-            'countdown': right_countdown
-        }
-    }, ensure_ascii=False)
-    return json_str
+    now = time.time() * 1000
+    for t, kind, side, value in follow_events(since, until, kinds):
+        if t > now:
+            out.flush()
+            now = time.time() * 1000
+            if t > now:
+                time.sleep((t - now) / 1000)
+                now = t
+        out.write(json.dumps({
+            'time': t,
+            'event': kind,
+            'side': side,
+            kind: value,
+            'tarkov_time': str(TarkovTime.at(side == 'left', t))
+        }) + '\n')
+    out.flush()
+
+def __getattr__(name):
+    # GUI 延遲加載: --api 同 import get_time_info 唔會載入 tkinter 同音效
+    if name in ('TimeDisplay', 'MainWindow'):
+        import eft_gui
+        return getattr(eft_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == '__main__':
+    import argparse
     parser = argparse.ArgumentParser(description='EFT Timer')
     alert_group = parser.add_mutually_exclusive_group()
     alert_group.add_argument('--wait_sun', '-l', action='store_true', help='啟動時開啟白天提醒')
     alert_group.add_argument('--wait_night', '-n', action='store_true', help='啟動時開啟夜晚提醒')
+    parser.add_argument('--alert', action='append', default=[], metavar='RULE',
+                        help="加提醒規則, 可以用多次, 例如 'night,-5m'(任何一邊入夜前5分鐘)、'right,day'、'night,once'")
     parser.add_argument('--maximize', '-m', action='store_true', help='以最大化方式啟動窗口')
     parser.add_argument('--update_time', '-u', type=int, default=1, help='設置更新時間間隔（秒），範圍1-60')
+    parser.add_argument('--precise', '-p', action='store_true', help='以毫秒精度顯示，時鐘每個塔科夫秒更新一次')
+    parser.add_argument('--font', nargs='?', const='MindEscape.ttf', metavar='FONT',
+                        help='顯示用嘅字體名或者 .ttf 文件，唔加參數就用內置嘅 MindEscape.ttf，預設 Calibri')
+    parser.add_argument('--window', action='append', nargs='?', const='', metavar='LAYOUT',
+                        help="多開一個時鐘窗口，可以用多次，LAYOUT 用逗號分隔: label/canvas、both/left/right、overlay(無邊框置頂)，例如 'canvas,overlay'")
+    parser.add_argument('--canvas', action='store_true', help='用單一 Canvas 畫時鐘（比較慳 CPU，適合疊喺遊戲上面）')
+    parser.add_argument('--startup', action='store_true', help='第一次畫好之後打印啟動各階段用咗幾耐')
+    parser.add_argument('--sound', metavar='WAV', help='用指定嘅WAV文件做提醒音效')
+    parser.add_argument('--drift', action='store_true', help='每60次更新打印一次排程誤差（毫秒）')
+    parser.add_argument('--stats', nargs='?', const='-', metavar='FILE',
+                        help='開啟更新循環統計, 關閉時(同每60次更新)寫入 FILE, 冇指定就關閉時打印; 撳 F12 顯示統計面板')
+    parser.add_argument('--shm', nargs='?', const=True, metavar='PATH',
+                        help='將狀態發佈到共享記憶體文件，俾其他進程用 eft_shm_reader.py 讀，預設放喺臨時目錄')
     parser.add_argument('--api', '-a', action='store_true', help='以API模式運行，返回JSON格式的時間信息')
+    parser.add_argument('--follow', '-f', action='store_true', help='配合 --api, 持續以 JSON Lines 格式輸出事件')
+    parser.add_argument('--events', default='phase', help='--follow 輸出嘅事件, 用逗號分隔: phase,countdown，預設 phase')
+    parser.add_argument('--since', type=parse_time, help='--follow 由呢個時間開始(毫秒時間戳或者 ISO 格式)')
+    parser.add_argument('--until', type=parse_time, help='--follow 去到呢個時間停止(毫秒時間戳或者 ISO 格式)')
+    parser.add_argument('--term', '-t', action='store_true', help='以終端機介面運行（冇顯示器嘅機器用）')
+    parser.add_argument('--serve', '-s', nargs='?', const='127.0.0.1:8765', metavar='ADDR',
+                        help='以本地服務器模式運行，ADDR 係 host:port 或者 Unix socket 路徑，預設 127.0.0.1:8765')
+    parser.add_argument('--pubsub', nargs='?', const=True, metavar='ADDR',
+                        help='以推送服務模式運行，客戶端訂閱日夜轉換/提醒，ADDR 係 host:port 或者 Unix socket 路徑，預設放喺臨時目錄')
     args = parser.parse_args()
+    args.events = tuple(filter(None, (e.strip() for e in args.events.split(','))))
+    unknown = [e for e in args.events if e not in EVENT_KINDS]
+    if unknown or not args.events:
+        parser.error(f'--events 只可以係 {",".join(EVENT_KINDS)}: {",".join(unknown) or "(空白)"}')
+    if args.alert:
+        from eft_alerts import parse_rule
+        try:
+            args.alert = [parse_rule(spec) for spec in args.alert]
+        except ValueError as e:
+            parser.error(str(e))
+    if args.shm is True:
+        from eft_shm_reader import DEFAULT_PATH
+        args.shm = DEFAULT_PATH
 
     if args.api:
-        if not getattr(sys, 'frozen', False):
+        if getattr(sys, 'frozen', False):
+            pass
+        elif args.follow:
+            try:
+                follow(args.since, args.until, args.events)
+            except (BrokenPipeError, KeyboardInterrupt):
+                sys.stdout = None  # 下游已經關咗, 唔好再 flush
+        else:
             print(get_time_info())
+    elif args.term:
+        from eft_term import main
+        try:
+            main(args.update_time, args.wait_sun, args.wait_night, args.shm, args.alert)
+        except FileExistsError as e:
+            parser.exit(1, f'{e}\n')
+    elif args.serve:
+        from eft_server import serve
+        try:
+            serve(args.serve)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f'{e}\n')
+    elif args.pubsub:
+        from eft_pubsub import DEFAULT_ADDRESS, serve
+        try:
+            serve(DEFAULT_ADDRESS if args.pubsub is True else args.pubsub)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f'{e}\n')
     else:
-        app = MainWindow(maximize=args.maximize, update_interval=args.update_time)
+        from eft_gui import BUNDLED_FONT, MainWindow, parse_layout
+        from tick_stats import StartupTimer
+        try:
+            layouts = [parse_layout(spec) for spec in args.window or ()]
+        except ValueError as e:
+            parser.error(str(e))
+        if args.font == 'MindEscape.ttf':
+            args.font = BUNDLED_FONT
+        if args.sound:
+            import sound_player
+            sound_player.configure(path=args.sound)
+        try:
+            app = MainWindow(maximize=args.maximize, update_interval=args.update_time,
+                             precise=args.precise, show_drift=args.drift, stats_path=args.stats,
+                             shm_path=args.shm, rules=args.alert, font_name=args.font,
+                             startup=StartupTimer(_started), show_startup=args.startup,
+                             renderer='canvas' if args.canvas else 'label')
+        except FileExistsError as e:
+            parser.exit(1, f'{e}\n')
+        for layout in layouts:
+            app.add_window(**layout)
         if args.wait_sun:
             app.toggle_day_alert()
         elif args.wait_night:
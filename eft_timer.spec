@@ -14,7 +14,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['numpy'],  # 只有批量轉換用到, GUI 唔需要
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
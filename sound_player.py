@@ -1,6 +1,180 @@
-import winsound
+import io
+import math
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+import wave
+
+def load_wav(path:str):
+    """讀入 WAV 文件並檢查格式, 之後只會喺記憶體重播
+
+    參數:
+        path (str): WAV 文件路徑
+
+    Raises:
+        wave.Error: 唔係有效嘅 WAV 文件
+
+    返回:
+        bytes: 完整嘅 WAV 文件內容
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    with wave.open(io.BytesIO(data)) as w:
+        w.getparams()
+    return data
+
+def make_beep(freq:int=880, duration:float=0.25, rate:int=22050):
+    """生成一段提示音(WAV), 冇指定音效文件時用
+
+    返回:
+        bytes: 完整嘅 WAV 文件內容
+    """
+    frames = int(duration * rate)
+    samples = (int(12000 * math.sin(2 * math.pi * freq * i / rate)) for i in range(frames))
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(struct.pack(f'<{frames}h', *samples))
+    return buf.getvalue()
+
+class SoundBackend:
+    """音效後端
+
+    load 喺開始時叫一次, 將音效準備好放喺記憶體;
+    play 喺背景線程叫, 可以阻塞到播完為止.
+    """
+    def load(self, path:str=None):
+        return load_wav(path) if path else make_beep()
+
+    def play(self, buffer):
+        raise NotImplementedError
+
+class WinsoundBackend(SoundBackend):
+    """Windows: 用 winsound 播放記憶體入面嘅 WAV, 冇指定文件就用系統提示音"""
+    def __init__(self):
+        import winsound  # 用到先載入, 唔好拖慢 --api
+        self.winsound = winsound
+
+    def load(self, path:str=None):
+        return load_wav(path) if path else None
+
+    def play(self, buffer):
+        if buffer is None:
+            self.winsound.PlaySound('SystemExclamation', self.winsound.SND_ALIAS)
+        else:
+            self.winsound.PlaySound(buffer, self.winsound.SND_MEMORY)
+
+class CommandBackend(SoundBackend):
+    """Linux: 將記憶體入面嘅 WAV 經 stdin 交俾 paplay/aplay 播放"""
+    commands = (('paplay',), ('aplay', '-q'))
+
+    def __init__(self, command:tuple=None):
+        if command is None:
+            command = next((c for c in self.commands if shutil.which(c[0])), None)
+        if command is None:
+            raise RuntimeError('找不到 paplay 或 aplay')
+        self.command = list(command)
+
+    def play(self, buffer):
+        subprocess.run(self.command, input=buffer, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+class NullBackend(SoundBackend):
+    """唔出聲, 冇音效設備嘅機器用"""
+    def load(self, path:str=None):
+        return load_wav(path) if path else b''
+
+    def play(self, buffer):
+        pass
+
+class RecordingBackend(NullBackend):
+    """唔出聲, 只記低每次播放嘅時間(time.monotonic()), 用嚟測試提醒時間"""
+    def __init__(self, duration:float=0.0):
+        self.duration = duration  # 模擬每次播放要幾耐(秒)
+        self.played = []
+
+    def play(self, buffer):
+        self.played.append(time.monotonic())
+        if self.duration:
+            time.sleep(self.duration)
+
+def default_backend():
+    """按平台揀音效後端"""
+    if sys.platform == 'win32':
+        return WinsoundBackend()
+    try:
+        return CommandBackend()
+    except RuntimeError:
+        return NullBackend()
+
+class AlertPlayer:
+    """背景線程播放器
+
+    音效只會載入一次; 播緊嘅時候再觸發會直接合併(唔排隊), 所以唔會阻塞 GUI,
+    亦唔會因為提醒間隔短過音效長度而越積越多.
+    """
+    def __init__(self, backend:SoundBackend=None, path:str=None):
+        self.backend = backend or default_backend()
+        self.buffer = self.backend.load(path)
+        self.played = 0  # 實際播放次數
+        self.coalesced = 0  # 被合併咗嘅觸發次數
+        self._busy = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='alert-player', daemon=True)
+        self._thread.start()
+
+    def trigger(self):
+        """觸發播放, 唔會阻塞
+
+        返回:
+            bool: 今次有冇真係開始播放
+        """
+        if self._busy:
+            self.coalesced += 1
+            return False
+        self._busy = True
+        self._wake.set()
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.backend.play(self.buffer)
+                self.played += 1
+            except Exception as e:
+                print(f"無法播放提醒音效: {e}")
+            finally:
+                self._busy = False
+
+_player = None
+
+def configure(backend:SoundBackend=None, path:str=None):
+    """設定 play_alert 用嘅音效後端同音效文件
+
+    參數:
+        backend (SoundBackend, optional): 音效後端, 預設值: None(按平台揀).
+        path (str, optional): WAV 文件路徑, 預設值: None(系統提示音).
+
+    返回:
+        AlertPlayer
+    """
+    global _player
+    _player = AlertPlayer(backend, path)
+    return _player
+
+def get_player():
+    """獲取 play_alert 用緊嘅播放器, 第一次用先建立"""
+    if _player is None:
+        configure()
+    return _player
 
 def play_alert():
-    """播放提醒音效
+    """播放提醒音效(非阻塞)
     """
-    winsound.PlaySound('SystemExclamation', winsound.SND_ALIAS | winsound.SND_ASYNC)
\ No newline at end of file
+    return get_player().trigger()
@@ -0,0 +1,156 @@
+# 更新循環嘅性能統計: 每個階段用咗幾耐、排程遲咗幾多、提醒響咗/壓咗幾多次
+
+import json
+import time
+from array import array
+from bisect import bisect_right
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)  # 毫秒
+STAGES = ('convert', 'phase', 'render', 'alert', 'schedule')
+
+class Histogram:
+    """固定桶嘅直方圖(毫秒), 桶喺建立時分配好, 記錄時唔會再分配"""
+    __slots__ = ('counts', 'stats')
+
+    def __init__(self):
+        self.counts = array('q', bytes(8 * (len(BUCKETS) + 1)))
+        self.stats = array('d', (0.0, 0.0, 0.0))  # 次數, 總和, 最大值
+
+    def add(self, ms:float):
+        self.counts[bisect_right(BUCKETS, ms)] += 1
+        stats = self.stats
+        stats[0] += 1
+        stats[1] += ms
+        if ms > stats[2]:
+            stats[2] = ms
+
+    def percentile(self, p:float):
+        """由桶估計百分位數(返回桶嘅上限)"""
+        target = self.stats[0] * p
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else self.stats[2]
+        return 0.0
+
+    def to_dict(self):
+        count, total, peak = self.stats
+        return {
+            'count': int(count),
+            'mean': round(total / count, 4) if count else 0.0,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'max': round(peak, 4),
+            'buckets': {f'<={b}': c for b, c in zip(BUCKETS, self.counts)} | {'>': self.counts[-1]}
+        }
+
+class TickStats:
+    """更新循環統計
+
+    用法: 每次更新開頭 start(), 每個階段完咗 lap(階段), 最後 end().
+    所有計數都係預先分配好嘅 array, 可以長開.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.tick_latency = Histogram()  # 每次更新用咗幾耐
+        self.lateness = Histogram()  # after() 實際比預定遲咗幾多
+        self.counters = array('q', (0, 0, 0))  # 更新次數, 響咗嘅提醒, 被 alert_interval 壓咗嘅提醒
+        self._start = 0.0
+        self._last = 0.0
+        self.started = time.time()
+
+    def start(self):
+        self._start = self._last = time.perf_counter()
+        self.counters[0] += 1
+
+    def lap(self, stage:str):
+        now = time.perf_counter()
+        self.stages[stage].add((now - self._last) * 1000)
+        self._last = now
+
+    def end(self):
+        self.tick_latency.add((time.perf_counter() - self._start) * 1000)
+
+    def late(self, ms:float):
+        self.lateness.add(abs(ms))
+
+    def alert_fired(self):
+        self.counters[1] += 1
+
+    def alert_suppressed(self):
+        self.counters[2] += 1
+
+    def to_dict(self):
+        return {
+            'uptime': round(time.time() - self.started, 1),
+            'ticks': self.counters[0],
+            'alerts_fired': self.counters[1],
+            'alerts_suppressed': self.counters[2],
+            'tick_latency_ms': self.tick_latency.to_dict(),
+            'lateness_ms': self.lateness.to_dict(),
+            'stages_ms': {stage: h.to_dict() for stage, h in self.stages.items()}
+        }
+
+    def summary(self):
+        """一行摘要, 狀態欄用"""
+        latency, late = self.tick_latency.stats, self.lateness.stats
+        return (f'ticks {self.counters[0]}  '
+                f'tick {latency[1] / max(1, latency[0]):.2f}/{latency[2]:.2f}ms  '
+                f'late p99 {self.lateness.percentile(0.99)}ms max {late[2]:.1f}ms  '
+                f'alerts {self.counters[1]}/{self.counters[2]}')
+
+    def dump(self, path:str):
+        """將統計寫成 JSON, path 係 '-' 就打印"""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path == '-':
+            print(text, flush=True)
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+class StartupTimer:
+    """記錄啟動時每個階段(import、Tk、字體、元件、第一次畫面)用咗幾耐"""
+    def __init__(self, start:float=None):
+        self.start = self._last = start if start is not None else time.perf_counter()
+        self.phases = {}  # {階段: 毫秒}
+
+    def mark(self, phase:str):
+        now = time.perf_counter()
+        self.phases[phase] = (now - self._last) * 1000
+        self._last = now
+
+    def to_dict(self):
+        return {**{phase: round(ms, 2) for phase, ms in self.phases.items()},
+                'total': round((self._last - self.start) * 1000, 2)}
+
+    def report(self):
+        """一行報告, 例如 'startup: imports 80.1ms, tk 30.2ms, ... total 150.3ms'"""
+        parts = [f'{phase} {ms:.1f}ms' for phase, ms in self.phases.items()]
+        return f'startup: {", ".join(parts)}, total {(self._last - self.start) * 1000:.1f}ms'
+
+class NullStats:
+    """唔開統計時用, 所有方法都唔做嘢"""
+    enabled = False
+
+    def start(self):
+        pass
+
+    def lap(self, stage:str):
+        pass
+
+    def end(self):
+        pass
+
+    def late(self, ms:float):
+        pass
+
+    def alert_fired(self):
+        pass
+
+    def alert_suppressed(self):
+        pass
+
+NULL_STATS = NullStats()